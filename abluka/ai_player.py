@@ -5,12 +5,20 @@ import os
 import datetime
 from copy import deepcopy
 
+from abluka.bitboard import get_geometry, popcount, OPPONENT_ABLUKA
+from abluka.transposition import TranspositionTable, EXACT, LOWER, UPPER
+from abluka.endgame import EndgameSolver
+from abluka.threats import ThreatSearch
+from abluka.proof_search import ProofNumberSearch, SolvedStore
+from abluka.mcts import MCTS, EXPLORATION
+
 class AIPlayer:
     """
     Geliştirilmiş Abluka AI
     - easy   : Sabit derinlikli Minimax/Alphabeta
     - normal : Iterative deepening + budamalı Minimax
     - hard   : Q-learning tabanlı self-play öğrenmesi + sabit Q-tablo kullanımı
+    - mcts   : Monte Carlo ağaç araması (UCT), güç süreyle ölçeklenir
 
     self-play sırasında:
       - exploration yüksek,
@@ -23,7 +31,8 @@ class AIPlayer:
       - ek eğitim (update) yapılmaz.
     """
 
-    def __init__(self, difficulty='normal', max_time=5.0):
+    def __init__(self, difficulty='normal', max_time=5.0, mcts_exploration=EXPLORATION,
+                 mcts_iterations=None, log_enabled=True):
         self.difficulty = difficulty
         self.max_time = float(max_time)  # her hamlede düşünülecek max süre (saniye)
 
@@ -44,6 +53,14 @@ class AIPlayer:
             self.min_safe_moves = 2  # Daha esnek (3→2)
             self.future_turns_check = 2  # 2 tur ilerisini kontrol et
             self.aggression = 0.65  # %65 saldırgan
+        elif self.difficulty == 'mcts':
+            self.base_depth = 0  # Ağaç derinliği süreyle belirlenir
+            self.max_time = max(self.max_time, 2.0)
+            self.ml_usage_factor = 0.0
+            self.randomness = 0.0
+            self.min_safe_moves = 1
+            self.future_turns_check = 0
+            self.aggression = 0.5
         else:  # 'hard'
             self.base_depth = 6  # Çok derin düşünme (5→6)
             self.max_time = max(self.max_time, 4.0)
@@ -54,7 +71,7 @@ class AIPlayer:
             self.aggression = 0.85  # %85 saldırgan - çok agresif!
 
         # Log / kayıt
-        self.log_enabled = True
+        self.log_enabled = log_enabled
         self.game_log = []
         self.log_file = self._create_log_file()
 
@@ -109,6 +126,66 @@ class AIPlayer:
         self.move_counter = 0
         self.last_move_reasoning = ""  # Debug amaçlı
 
+        # Alpha-beta arama durumu: skorlar ana oyuncuya göre olduğundan
+        # her ana oyuncu için ayrı transpozisyon tablosu tutulur.
+        self.transposition = {}
+        self.search_stats = dict.fromkeys(
+            ('nodes', 'obstacle_nodes', 'pvs_null_windows', 'pvs_researches',
+             'aspiration_searches', 'aspiration_fail_low', 'aspiration_fail_high',
+             'lmr_reductions', 'lmr_researches', 'futility_prunes'), 0)
+        # Aspirasyon penceresi: aynı tek/çift derinliğin son skoru +/- bu değer
+        # (değerlendirme derinliğin tek/çift olmasına göre ~800 salınıyor)
+        self.aspiration_window = 350
+        self._search_timed_out = False
+        self._root_ranking = []
+
+        # İç düğüm sıralaması: taraf başına adım yönü (dr, dc -> 0..8) ve
+        # engel karesi geçmiş tabloları, kesme yapan hamlelerle artar;
+        # ayrıca kök uzaklığına (katman) göre ikişer killer engel
+        cell_count = get_geometry(7).cell_count
+        self.step_history = {'B': [0] * 9, 'W': [0] * 9}
+        self.obstacle_history = {'B': [0] * cell_count, 'W': [0] * cell_count}
+        self.killers = []
+        self._root_depth = 0
+        self.interior_obstacle_limit = 10
+
+        # Geç engel azaltması (LMR): sıralamada lmr_min_index ve sonrası,
+        # rakibe bitişik olmayan engeller bir tur sığ aranır; sınırı
+        # geçerse tam derinlikte yeniden aranır.
+        # Sınır düğümü budaması: son turda adım sonrası değerlendirme
+        # + futility_margin pencereye ulaşamıyorsa engeller aranmaz
+        # (tek engelin değerlendirmeyi değiştirmesi ~%97 olasılıkla < 600).
+        # Kural (ikisi için de): budama ancak sabit pozisyon setinde
+        # budamasız aramayla aynı hamleleri verirse ya da budamasız
+        # aramaya karşı maçta açıkça üstün gelirse varsayılan olarak açılır.
+        # Şimdilik ikisi de kapalı: aynı hamle LMR 10/12, futility 11/12;
+        # LMR açık/kapalı maçı 14-10 (anlamlı değil).
+        # Doğrulama: python -m abluka.benchmark search
+        self.use_lmr = False
+        self.lmr_min_index = 3
+        self.use_futility = False
+        self.futility_margin = 600
+
+        # Taşlar ayrıldığında kesin oyun sonu çözücüsü (sınır tabloları
+        # oyun boyunca korunur); arama içinde daha küçük bütçe kullanılır
+        self.endgame = EndgameSolver()
+        self.endgame_search_budget = 2000
+
+        # Zorunlu abluka araması (zor mod: kazanç ve kayıp tespiti)
+        self.threats = ThreatSearch()
+
+        # Kanıtlanmış pozisyonlar (toplu çözüm: python -m abluka.proof_search)
+        # ve oyun sonuna yaklaşınca kısa df-pn araması
+        self.solved_store = SolvedStore()
+        self.proof_search = ProofNumberSearch(endgame=self.endgame)
+        self.proof_search_budget = 3000
+        self.proof_search_free_cells = 24
+
+        # MCTS modu: keşif katsayısı ve (isteğe bağlı) iterasyon sınırı;
+        # süre sınırı her zaman max_time'dır
+        self.mcts = MCTS(exploration=mcts_exploration)
+        self.mcts_iterations = mcts_iterations
+
         # ML sadece 'hard' modda gerçek anlamda aktif
         self.learning_enabled = (self.difficulty == 'hard')
 
@@ -162,10 +239,11 @@ class AIPlayer:
                 if board_state:
                     f.write("Tahta Durumu:\n")
                     size = board_state.size
+                    grid = board_state.grid
                     for r in range(size):
                         row_txt = []
                         for c in range(size):
-                            cell = board_state.grid[r][c]
+                            cell = grid[r][c]
                             if cell == 'B':
                                 row_txt.append('B')
                             elif cell == 'W':
@@ -207,8 +285,8 @@ class AIPlayer:
 
         print(f"\n[AI] {player} (AI) hamle yapıyor. Zorluk: {self.difficulty}")
         print(f"[AI] Siyah: {board.black_pos}, Beyaz: {board.white_pos}")
-        print(f"[AI] Siyah hamleleri: {len(board.get_valid_moves('B'))}, "
-              f"Beyaz hamleleri: {len(board.get_valid_moves('W'))}")
+        print(f"[AI] Siyah hamleleri: {board.mobility('B')}, "
+              f"Beyaz hamleleri: {board.mobility('W')}")
 
         # Tahmini kazanma
         win_prob = self._calculate_win_probability(board, player)
@@ -234,6 +312,35 @@ class AIPlayer:
                     time.sleep(0.5 - elapsed)
                 return mv, obs
 
+        # Taşlar ayrıldıysa oyun sonu kesin çözülür (kolay mod hariç)
+        if self.difficulty != 'easy':
+            proven = self.endgame.best_turn(board, player)
+            if proven:
+                mv, obs, winner = proven
+                if winner == player:
+                    self.current_message = self._random_reaction(self.emojis['smug'], self.messages['confident'])
+                    self.last_move_reasoning = "Oyun sonu çözücü => Kesin kazanç"
+                else:
+                    self.last_move_reasoning = "Oyun sonu çözücü => Kayıp, en uzun direniş"
+                print(f"[AI] {self.last_move_reasoning}: {mv}, engel {obs} ({self.endgame.stats()})")
+                self._log_move(player, mv, obs, self.last_move_reasoning, board)
+                elapsed = time.time() - start_time
+                if elapsed < 0.5:
+                    time.sleep(0.5 - elapsed)
+                return mv, obs
+
+            proven = self._proven_move(board, player)
+            if proven:
+                mv, obs = proven
+                self.current_message = self._random_reaction(self.emojis['smug'], self.messages['confident'])
+                self.last_move_reasoning = "Kanıtlanmış pozisyon => Kesin kazanç"
+                print(f"[AI] {self.last_move_reasoning}: {mv}, engel {obs} ({self.proof_search.stats()})")
+                self._log_move(player, mv, obs, self.last_move_reasoning, board)
+                elapsed = time.time() - start_time
+                if elapsed < 0.5:
+                    time.sleep(0.5 - elapsed)
+                return mv, obs
+
         # İnsan benzeri düşünme süresi simülasyonu
         # Zor durumlarda daha uzun düşün
         my_moves_count = len(valid_moves)
@@ -251,6 +358,8 @@ class AIPlayer:
             mv, obs = self._choose_move_old_normal(board, player, self.max_time, start_time)
         elif self.difficulty == 'normal':
             mv, obs = self._choose_move_old_hard(board, player, self.max_time, start_time)
+        elif self.difficulty == 'mcts':
+            mv, obs = self._choose_move_mcts(board, player, self.max_time, start_time)
         else:
             mv, obs = self._choose_move_ultra_ml(board, player, self.max_time, start_time)
 
@@ -264,8 +373,8 @@ class AIPlayer:
             temp_b.place_obstacle(obs)
             fut_prob = self._calculate_win_probability(temp_b, player)
             opponent = ('W' if player == 'B' else 'B')
-            opp_m = len(temp_b.get_valid_moves(opponent))
-            my_m = len(temp_b.get_valid_moves(player))
+            opp_m = temp_b.mobility(opponent)
+            my_m = temp_b.mobility(player)
             print(f"[AI] Sonrası kazanma: %{fut_prob:.1f}")
             print(f"[AI] Rakip hamle: {opp_m}, Benim hamle: {my_m}")
             
@@ -286,6 +395,48 @@ class AIPlayer:
     def get_reaction(self):
         return self.current_message
 
+    def _proven_move(self, board, player):
+        """
+        Depoda kazanç olarak kayıtlı pozisyonun hamlesi. Kayıt yoksa ve
+        tahtada az boş kare kaldıysa kısa bir df-pn araması yapılır;
+        kanıtlanan sonuç (kazanç ya da kayıp) depoya eklenir.
+        """
+        known = self.solved_store.lookup(board, player)
+        if known is None and popcount(board.free_bits) <= self.proof_search_free_cells:
+            known = self.proof_search.solve(board, player, self.proof_search_budget)
+            if known is not None:
+                self.solved_store.record(board, player, *known)
+        if known and known[0]:
+            return known[1], known[2]
+        return None
+
+    # -------------------------------
+    # MCTS => UCT
+    # -------------------------------
+    def _choose_move_mcts(self, board, player, time_limit, start_time):
+        """
+        Kalan süre (ve varsa iterasyon sınırı) boyunca UCT araması yapar;
+        en çok ziyaret edilen tur oynanır. Sayaçlar search_stats'a yazılır.
+        """
+        remaining = max(0.05, time_limit - (time.time() - start_time))
+        best = self.mcts.search(board, player, remaining, self.mcts_iterations)
+        stats = self.mcts.stats()
+        self.search_stats.update(stats)
+        print(f"[AI-MCTS] {stats['iterations']} iterasyon, "
+              f"{stats['iterations_per_sec']:,.0f} iterasyon/sn, "
+              f"{stats['tree_nodes']} düğüm, derinlik {stats['max_depth']}")
+        if best is None:
+            # Kendini kapatmayan tur yok; ilk geçerli tur oynanır
+            code = next(board.iter_turns(player, exclude_self_abluka=False), None)
+            if code is None:
+                return None, None
+            self.last_move_reasoning = "MCTS => Çıkış yok"
+            return board.turn_positions(code)
+        win_rate = stats['best_win_rate'] * 100
+        self.last_move_reasoning = (f"MCTS => En çok ziyaret edilen tur "
+                                    f"({stats['best_visits']} ziyaret, %{win_rate:.0f})")
+        return best
+
     # -------------------------------
     # EASY => Sabit Derinlikli
     # -------------------------------
@@ -307,6 +458,7 @@ class AIPlayer:
         
         # ÖNCE GÜVENLİ HAMLELERİ TOPLA
         safe_moves = []
+        keep = self._root_orbit_filter(board)
         
         for mv in valid_moves:
             tmpb = self._clone_board(board)
@@ -319,6 +471,8 @@ class AIPlayer:
             
             # Her hamle için güvenli engelleri bul
             for obs in empties:
+                if keep and not keep(mv, obs):
+                    continue
                 is_safe, reason = self._is_safe_move(board, player, mv, obs)
                 
                 if is_safe:
@@ -326,8 +480,8 @@ class AIPlayer:
                     tb2.place_obstacle(obs)
                     
                     # Basit skor hesaplama
-                    my_moves_after = len(tb2.get_valid_moves(player))
-                    opp_moves_after = len(tb2.get_valid_moves(opponent))
+                    my_moves_after = tb2.mobility(player)
+                    opp_moves_after = tb2.mobility(opponent)
                     
                     # Basit: Benim hamlem çok, rakibin az
                     simple_score = my_moves_after * 15 - opp_moves_after * 10
@@ -377,56 +531,16 @@ class AIPlayer:
         self.last_move_reasoning = f"Kolay => En iyi güvenli (skor: {best[2]:.0f})"
         return best[0], best[1]
 
-    def _minimax_evaluation(self, board, depth, maximizing, main_player, alpha, beta):
-        if depth==0:
-            return self._evaluate_board(board, main_player)
-        current = main_player if maximizing else ('W' if main_player=='B' else 'B')
-        if board.is_abluka(current):
-            return -999999 if current==main_player else 999999
-        val_moves = board.get_valid_moves(current)
-        if not val_moves:
-            return -999999 if current==main_player else 999999
-
-        if maximizing:
-            value = float('-inf')
-            for mv in val_moves[:4]:
-                b2 = self._clone_board(board)
-                b2.move_piece(current, mv)
-                empties = self._get_empty_positions(b2)
-                if empties:
-                    b2.place_obstacle(empties[0])
-                sc = self._minimax_evaluation(b2, depth-1, False, main_player, alpha, beta)
-                value = max(value, sc)
-                alpha = max(alpha, value)
-                if beta<=alpha:
-                    break
-            return value
-        else:
-            value = float('inf')
-            for mv in val_moves[:4]:
-                b2 = self._clone_board(board)
-                b2.move_piece(current, mv)
-                empties = self._get_empty_positions(b2)
-                if empties:
-                    b2.place_obstacle(empties[0])
-                sc = self._minimax_evaluation(b2, depth-1, True, main_player, alpha, beta)
-                value = min(value, sc)
-                beta = min(beta, value)
-                if beta<=alpha:
-                    break
-            return value
-
     # -------------------------------
     # NORMAL => Iterative Deepening
     # -------------------------------
     def _choose_move_old_hard(self, board, player, time_limit, start_time):
         """
-        ULTRA İYİLEŞTİRİLMİŞ NORMAL mod:
-        - AGRESYF + AKILLI STRATEJİ
-        - Gelecek turları simüle eder
-        - Çok iyi pozisyon değerlendirmesi
-        - Rakibi ezmeye odaklanır
-        - Minimax + heuristic
+        NORMAL mod: Iterative deepening alpha-beta
+        - Önce güvenli direkt kazanç aranır
+        - Sonra süre bitene kadar derinlik artırılarak aranır;
+          son TAMAMLANAN derinliğin sıralaması kullanılır
+        - En iyi adaylardan güvenli olan seçilir
         """
         valid_moves = board.get_valid_moves(player)
         opponent = ('W' if player=='B' else 'B')
@@ -434,12 +548,15 @@ class AIPlayer:
         print(f"[AI-NORMAL] {len(valid_moves)} hamle değerlendiriliyor...")
 
         # 1. HIZLI KAZANÇ KONTROL ET (ve güvenli olsun)
+        keep = self._root_orbit_filter(board)
         for mv in valid_moves:
             tb = self._clone_board(board)
             tb.move_piece(player, mv)
             empties = self._get_empty_positions(tb)
             
             for obs in empties[:15]:  # 10→15 daha fazla kontrol
+                if keep and not keep(mv, obs):
+                    continue
                 is_safe, _ = self._is_safe_move(board, player, mv, obs)
                 if not is_safe:
                     continue
@@ -451,154 +568,302 @@ class AIPlayer:
                     self.last_move_reasoning = "Normal => Güvenli direkt kazanç!"
                     return mv, obs
         
-        # 2. GÜVENLİ VE AGRESYF HAMLELERİ TOPLA
-        safe_moves = []
+        # 2. ITERATIVE DEEPENING
+        depth, ranking = self._iterative_deepening(board, player, time_limit, start_time)
         
-        for mv in valid_moves:
-            if time.time() - start_time > time_limit * 0.85:
-                break
-            
-            tmpb = self._clone_board(board)
-            tmpb.move_piece(player, mv)
-            empties = self._get_empty_positions(tmpb)
-            
-            # Engel seçimini optimize et - daha fazla kontrol
-            if len(empties) > 15:
-                empties = self._prune_obstacles(tmpb, empties, player, 15)  # 10→15
-            
-            for obs in empties:
-                if time.time() - start_time > time_limit * 0.9:
-                    break
-                
-                # Güvenlik kontrolü
-                is_safe, reason = self._is_safe_move(board, player, mv, obs)
-                if not is_safe:
-                    continue
-                
-                testb = self._clone_board(tmpb)
-                testb.place_obstacle(obs)
-                
-                # POZİSYON DEĞERLENDİRMESİ - Çok detaylı
-                score = self._evaluate_board(testb, player)
-                
-                # Kaçış yolları bonusu
-                escape = self._get_escape_routes(testb, player)
-                score += escape * 1.2  # 1.0→1.2 daha önemli
-                
-                # RAKİBE VERİLEN ZARAR - ULTRA BONUS
-                opp_moves_before = len(board.get_valid_moves(opponent))
-                opp_moves_after = len(testb.get_valid_moves(opponent))
-                damage = opp_moves_before - opp_moves_after
-                
-                if damage > 0:
-                    score += damage * 80  # Her azalan hamle için dev bonus
-                
-                # Rakibi çok sınırladıysak ekstra bonus
-                if opp_moves_after <= 3:
-                    score += 500  # Rakip neredeyse ablukada!
-                elif opp_moves_after <= 5:
-                    score += 250  # Rakip zorlanıyor
-                
-                # Minimax değerlendirmesi (hafif, çünkü zaman alıyor)
-                if time.time() - start_time < time_limit * 0.7:
-                    minimax_score = self._minimax_evaluation(testb, 2, True, player, 
-                                                             float('-inf'), float('inf'))
-                    score += minimax_score / 5.0  # Minimax'ı da dikkate al
-                
-                safe_moves.append((mv, obs, score))
+        if not ranking:
+            print("[AI-NORMAL] Arama sonuç vermedi, kolay mod stratejisi")
+            return self._choose_move_old_normal(board, player, time_limit, start_time)
         
-        print(f"[AI-NORMAL] {len(safe_moves)} güvenli hamle bulundu")
+        print(f"[AI-NORMAL] Derinlik {depth} tamamlandı, {len(ranking)} aday, "
+              f"{self.search_stats['nodes']} düğüm")
         
+        # 3. En iyi adaylardan güvenli olanları al (ilk 10'a bakmak yeterli)
+        safe_moves = []
+        for sc, mv, obs in ranking[:10]:
+            is_safe, _ = self._is_safe_move(board, player, mv, obs)
+            if is_safe:
+                safe_moves.append((mv, obs, sc))
         if not safe_moves:
-            print("[AI-NORMAL] UYARI: Güvenli hamle yok! Esnek modda deniyorum")
-            # Esnek mod: Daha az kısıtlı güvenlik
-            for mv in valid_moves[:8]:  # 5→8 daha fazla dene
-                tmpb = self._clone_board(board)
-                tmpb.move_piece(player, mv)
-                empties = self._get_empty_positions(tmpb)
-                
-                if len(empties) > 15:
-                    empties = self._prune_obstacles(tmpb, empties, player, 15)
-                
-                for obs in empties[:15]:  # 10→15 daha fazla
-                    tb = self._clone_board(tmpb)
-                    tb.place_obstacle(obs)
-                    
-                    # Daha esnek güvenlik: En azından abluka olmamalı
-                    if not tb.is_abluka(player) and len(tb.get_valid_moves(player)) >= 2:
-                        score = self._evaluate_board(tb, player)
-                        safe_moves.append((mv, obs, score))
-            
-            if not safe_moves:
-                # Hala yok, kolay moda düş
-                print("[AI-NORMAL] Son çare: Kolay mod stratejisi")
-                return self._choose_move_old_normal(board, player, time_limit, start_time)
-        
-        # En iyi hamleyi seç
-        safe_moves.sort(key=lambda x: x[2], reverse=True)
+            print("[AI-NORMAL] UYARI: Güvenli aday yok, aramanın en iyisi oynanıyor")
+            sc, mv, obs = ranking[0]
+            safe_moves.append((mv, obs, sc))
         
         # Çok az rastgelelik: %8
-        if random.random() < self.randomness and len(safe_moves) > 8:
-            # En iyi %20'lik dilimden seç (çok dar - neredeyse en iyisi)
-            top_portion = max(3, int(len(safe_moves) * 0.2))  # 0.3→0.2
-            choice = random.choice(safe_moves[:top_portion])
-            self.last_move_reasoning = f"Normal => Üst seviye hamle (skor: {choice[2]:.0f})"
+        if random.random() < self.randomness and len(safe_moves) > 3:
+            choice = random.choice(safe_moves[:3])
+            self.last_move_reasoning = f"Normal => Üst seviye hamle (d={depth}, skor: {choice[2]:.0f})"
             return choice[0], choice[1]
         
         best = safe_moves[0]
-        self.last_move_reasoning = f"Normal => Optimal hamle (skor: {best[2]:.0f})"
+        self.last_move_reasoning = f"Normal => Optimal hamle (d={depth}, skor: {best[2]:.0f})"
         return best[0], best[1]
 
-    def _search_best_move(self, board, player, depth, start_time, time_limit):
+    def _iterative_deepening(self, board, player, time_limit, start_time):
+        """
+        Derinliği 0'dan base_depth-1'e kadar artırarak _search_best_move çağırır.
+        Her derinlik bir önceki derinliğin kök sıralamasıyla başlar (aynı
+        transpozisyon tablosu da paylaşılır). Süre aşımıyla yarıda kalan
+        derinliğin sonucu atılır.
+        İkinci derinlikten sonra arama, iki derinlik önceki (aynı tek/çift)
+        skorun çevresindeki aspirasyon penceresiyle başlar; skor pencere
+        dışına düşerse o taraf açılarak yeniden aranır (sayaçlar search_stats'ta).
+        Dönüş: (tamamlanan derinlik, [(skor, hamle, engel), ...] en iyiden kötüye)
+        """
+        for counter in self.search_stats:
+            self.search_stats[counter] = 0
+        self._age_history()
+        completed_depth = -1
+        ranking = []
+        root_order = None
+        scores = []
+
+        for depth in range(self.base_depth):
+            # Bir sonraki derinlik öncekinden çok daha uzun sürer;
+            # sürenin yarısı geçtiyse yeni derinliğe başlama
+            if depth > 0 and time.time() - start_time > time_limit * 0.5:
+                break
+            if len(scores) >= 2 and abs(scores[-2]) < 999999:
+                centre = scores[-2]
+                window = (centre - self.aspiration_window, centre + self.aspiration_window)
+                self.search_stats['aspiration_searches'] += 1
+            else:
+                window = (float('-inf'), float('inf'))
+            while True:
+                mv, obs, score = self._search_best_move(board, player, depth, start_time,
+                                                        time_limit, root_order, window)
+                if self._search_timed_out:
+                    break
+                if score <= window[0] and window[0] > float('-inf'):
+                    self.search_stats['aspiration_fail_low'] += 1
+                    window = (float('-inf'), window[1])
+                elif score >= window[1] and window[1] < float('inf'):
+                    self.search_stats['aspiration_fail_high'] += 1
+                    window = (window[0], float('inf'))
+                else:
+                    break
+            if self._search_timed_out:
+                break
+            scores.append(score)
+            completed_depth = depth
+            ranking = self._root_ranking
+            root_order = [(m, o) for _, m, o in ranking]
+            # Kesin kazanç/kayıp bulunduysa daha derine inmeye gerek yok
+            if mv is None or abs(score) >= 999999:
+                break
+
+        return completed_depth, ranking
+
+    def _search_best_move(self, board, player, depth, start_time, time_limit, root_order=None,
+                          window=None):
+        """
+        Kök düğüm araması. root_order verilirse (önceki iterasyonun
+        sıralaması) kök çocukları o sırayla denenir; derinlik >= 3'te
+        bu sıralamanın sadece ilk 36 adayı aranır. window (alpha, beta)
+        aspirasyon penceresidir; verilmezse tam pencere.
+        İlk çocuktan sonrakiler sıfır pencereyle (PVS) sınanır, alpha'yı
+        geçen çocuk tam pencereyle yeniden aranır.
+        Kök çocukları self._root_ranking'e yazılır: önce kesin skorlu olanlar
+        (pencere içinde kalan; derinlik 0'da hepsi) skora göre, sonra sıfır
+        pencereden sadece üst sınır alanlar arama sırasıyla (yani önceki
+        derinliğin sıralamasıyla). Simetrik pozisyonlarda her (hamle, engel)
+        yörüngesinden tek temsilci aranır.
+        """
         best_mv = None
         best_obs = None
         best_score = float('-inf')
+        self._root_ranking = []
+        # Önceki aramanın süre aşımı bayrağı erken dönüşlere taşınmamalı
+        self._search_timed_out = False
 
         val_moves = board.get_valid_moves(player)
         if not val_moves:
             return None, None, -999999
-        if len(val_moves)>6 and depth>=3:
-            val_moves = self._prune_moves(board, player, val_moves, 6)
 
-        alpha = float('-inf')
-        beta = float('inf')
+        # Taşlar ayrıldıysa kök de kesin çözülür
+        proven = self.endgame.best_turn(board, player)
+        if proven:
+            mv, obs, winner = proven
+            score = 999999 if winner == player else -999999
+            self._root_ranking = [(score, mv, obs)]
+            return mv, obs, score
+
+        alpha, beta = window or (float('-inf'), float('inf'))
         opponent = ('W' if player=='B' else 'B')
+        self._root_depth = depth
+        while len(self.killers) <= depth:
+            self.killers.append([None, None])
 
-        for mv in val_moves:
-            if time.time()-start_time>time_limit*0.9:
-                break
-            tmpb = self._clone_board(board)
-            tmpb.move_piece(player, mv)
-            empties = self._get_empty_positions(tmpb)
-            if depth>=3 and len(empties)>6:
-                empties = self._prune_obstacles(tmpb, empties, player, 6)
-            for obs in empties:
-                if time.time()-start_time>time_limit:
-                    break
-                testb = self._clone_board(tmpb)
-                testb.place_obstacle(obs)
-                if testb.is_abluka(player):
-                    continue
-                if testb.is_abluka(opponent):
+        keep = None if root_order else self._root_orbit_filter(board)
+
+        # Arama tek bir kopya üzerinde push/pop ile yapılır
+        board = board.copy()
+
+        if root_order:
+            children = root_order[:36] if depth>=3 else root_order
+        elif depth>=3:
+            if len(val_moves)>6:
+                val_moves = self._prune_moves(board, player, val_moves, 6)
+            children = []
+            for mv in val_moves:
+                board.push(player, mv, None)
+                empties = self._get_empty_positions(board)
+                if len(empties)>6:
+                    empties = self._prune_obstacles(board, empties, player, 6)
+                children.extend((mv, obs) for obs in empties
+                                if not keep or keep(mv, obs))
+                board.pop()
+        else:
+            # Tüm kök turları tek geçişte üretilir (kendini abluka edenler
+            # hariç, ölü karelere engel adım başına tek tur)
+            children = []
+            for code in board.iter_turns(player, collapse_dead_cells=True):
+                mv, obs = board.turn_positions(code)
+                if code & OPPONENT_ABLUKA:
+                    self._root_ranking = [(999999, mv, obs)]
                     return mv, obs, 999999
-                sc = self._alpha_beta_minimax(testb, depth, False, player, alpha, beta, start_time, time_limit)
-                if sc>best_score:
-                    best_score = sc
-                    best_mv = mv
-                    best_obs = obs
-                alpha = max(alpha, best_score)
-                if beta<=alpha:
-                    break
+                if keep and not keep(mv, obs):
+                    continue
+                children.append((mv, obs))
+
+        scored = []
+        bounded = []
+        for mv, obs in children:
+            if time.time()-start_time>time_limit:
+                self._search_timed_out = True
+                break
+            board.push(player, mv, obs)
+            if board.is_abluka(player):
+                board.pop()
+                continue
+            if board.is_abluka(opponent):
+                board.pop()
+                self._root_ranking = [(999999, mv, obs)]
+                return mv, obs, 999999
+            if best_mv is None or alpha == float('-inf'):
+                sc = self._alpha_beta_minimax(board, depth, False, player, alpha, beta, start_time, time_limit)
+            else:
+                self.search_stats['pvs_null_windows'] += 1
+                sc = self._alpha_beta_minimax(board, depth, False, player, alpha, alpha + 1, start_time, time_limit)
+                if alpha < sc < beta:
+                    self.search_stats['pvs_researches'] += 1
+                    sc = self._alpha_beta_minimax(board, depth, False, player, alpha, beta, start_time, time_limit)
+            board.pop()
+            # Sıfır pencere ya da yükselmiş alpha altında kalan skor sadece üst sınırdır
+            if depth == 0 or alpha < sc < beta:
+                scored.append((sc, mv, obs))
+            else:
+                bounded.append((sc, mv, obs))
+            if sc>best_score:
+                best_score = sc
+                best_mv = mv
+                best_obs = obs
+            alpha = max(alpha, best_score)
+            if alpha >= beta:
+                # Aspirasyon penceresinin üstü: çağıran pencereyi açıp yeniden arar
+                break
+
+        # Eşit skorlarda önceki sıralama korunur (sort kararlıdır)
+        scored.sort(key=lambda x: x[0], reverse=True)
+        self._root_ranking = scored + bounded
         return best_mv, best_obs, best_score
 
+    def _age_history(self):
+        """Yeni hamle aramasından önce: geçmiş yarıya iner, killerlar silinir."""
+        for table in (self.step_history, self.obstacle_history):
+            for side in table.values():
+                for i in range(len(side)):
+                    side[i] >>= 1
+        self.killers = []
+
+    def _order_obstacles(self, board, current, ply, tt_obs):
+        """
+        İç düğüm engel adayları (_prune_obstacles yerine, değerlendirme ve
+        yayılım yapılmadan): tablo engeli, katmanın killer engelleri, sonra
+        geçmiş puanı + rakibe yakınlık sırasıyla en fazla
+        interior_obstacle_limit kare. Ölü karelerden sadece temsilci aday olur.
+        """
+        geo = board.geo
+        cells = geo.cells
+        nmasks = geo.neighbour_masks
+        opp = board.piece_index('W' if current == 'B' else 'B')
+        me = board.piece_index(current)
+        free = board.free_bits
+        opp_near = nmasks[opp] & free
+        opp_ring = geo.dilate(nmasks[opp]) & free & ~opp_near
+        my_near = nmasks[me] & free
+        history = self.obstacle_history[current]
+
+        def score(i):
+            bit = geo.bits[i]
+            sc = history[i]
+            if bit & opp_near:
+                sc += 1000
+            elif bit & opp_ring:
+                sc += 300
+            if bit & my_near:
+                sc -= 200
+            return sc
+
+        first = []
+        if tt_obs is not None and board.is_empty(tt_obs):
+            first.append(geo.index(tt_obs))
+        targets = board.obstacle_targets()
+        for killer in self.killers[ply]:
+            if killer is not None and (targets >> killer) & 1 and killer not in first:
+                first.append(killer)
+        rest = sorted((i for i in geo.iter_indices(targets) if i not in first),
+                      key=score, reverse=True)
+        limit = max(self.interior_obstacle_limit, len(first))
+        return [cells[i] for i in (first + rest)[:limit]]
+
+    def _record_cutoff(self, current, depth, ply, step_from=None, step_to=None, obstacle=None):
+        """
+        Kesme yapan adım yönünü / engeli (kare indeksi) geçmişe, engeli
+        ayrıca katmanın killerlarına ekler.
+        """
+        bonus = depth * depth
+        if step_to is not None:
+            direction = (step_to[0] - step_from[0] + 1) * 3 + (step_to[1] - step_from[1] + 1)
+            self.step_history[current][direction] += bonus
+        if obstacle is not None:
+            self.obstacle_history[current][obstacle] += bonus
+            killers = self.killers[ply]
+            if killers[0] != obstacle:
+                killers[1] = killers[0]
+                killers[0] = obstacle
+
+    def _transposition_table(self, main_player):
+        table = self.transposition.get(main_player)
+        if table is None:
+            table = TranspositionTable()
+            self.transposition[main_player] = table
+        return table
+
     def _alpha_beta_minimax(self, board, depth, maximizing, main_player, alpha, beta, start_time, time_limit):
+        """
+        Tur düğümü (adım katmanı). Her tur iki katmanda aranır: burada
+        sıradaki oyuncunun adımı seçilir, engel _obstacle_ply'de seçilir.
+        Böylece kesme adım seçiminden sonra da gerçekleşebilir ve adım
+        sonrası pozisyonların da kendi tablo kaydı olur.
+        board üzerinde push/pop ile yerinde arama yapar; dönüşte board
+        çağrıldığı andaki haline geri getirilmiş olur.
+        Sonuçlar (derinlik, sınır tipi, skor, en iyi hamle) transpozisyon
+        tablosuna yazılır; süre aşımıyla kesilen aramalar yazılmaz.
+        """
+        self.search_stats['nodes'] += 1
         if time.time()-start_time>time_limit:
-            return self._evaluate_board(board, main_player)
-        if depth==0:
+            self._search_timed_out = True
             return self._evaluate_board(board, main_player)
 
         current = main_player if maximizing else ('W' if main_player=='B' else 'B')
-        opp = ('W' if current=='B' else 'B')
+
+        # Taşlar ayrıldıysa sonuç kesin: çözücü cevap verirse aramaya gerek yok
+        proven = self.endgame.solve(board, current, self.endgame_search_budget)
+        if proven is not None:
+            return 999999 if proven == main_player else -999999
+        if depth==0:
+            return self._evaluate_board(board, main_player)
 
         if board.is_abluka(current):
             return -999999 if current==main_player else 999999
@@ -606,56 +871,216 @@ class AIPlayer:
         if not val_moves:
             return -999999 if current==main_player else 999999
 
-        if maximizing:
-            value = float('-inf')
-            for mv in val_moves:
-                if time.time()-start_time>time_limit: break
-                b2 = self._clone_board(board)
-                b2.move_piece(current, mv)
-                empties = self._get_empty_positions(b2)
-                if len(empties)>6:
-                    empties = self._prune_obstacles(b2, empties, current, 6)
-                for obs in empties:
-                    if time.time()-start_time>time_limit: break
-                    b3 = self._clone_board(b2)
-                    b3.place_obstacle(obs)
-                    if b3.is_abluka(current):
-                        continue
-                    if b3.is_abluka(opp):
-                        return 999999
-                    sc = self._alpha_beta_minimax(b3, depth-1, False, main_player, alpha, beta, start_time, time_limit)
-                    value = max(value, sc)
-                    alpha = max(alpha, value)
-                    if beta<=alpha:
-                        break
-                if beta<=alpha:
-                    break
-            return value
-        else:
-            value = float('inf')
-            for mv in val_moves:
-                if time.time()-start_time>time_limit: break
-                b2 = self._clone_board(board)
-                b2.move_piece(current, mv)
-                empties = self._get_empty_positions(b2)
-                if len(empties)>6:
-                    empties = self._prune_obstacles(b2, empties, current, 6)
-                for obs in empties:
-                    if time.time()-start_time>time_limit: break
-                    b3 = self._clone_board(b2)
-                    b3.place_obstacle(obs)
-                    if b3.is_abluka(current):
-                        continue
-                    if b3.is_abluka(main_player):
-                        return -999999
-                    sc = self._alpha_beta_minimax(b3, depth-1, True, main_player, alpha, beta, start_time, time_limit)
-                    value = min(value, sc)
-                    beta = min(beta, value)
-                    if beta<=alpha:
-                        break
-                if beta<=alpha:
-                    break
-            return value
+        # Adım sıralaması: yön geçmişi, eşitlikte gidilen karede serbest
+        # komşusu çok olan önce
+        geo = board.geo
+        here = board.black_pos if current == 'B' else board.white_pos
+        free = board.free_bits | geo.bits[geo.index(here)]
+        history = self.step_history[current]
+        val_moves.sort(key=lambda m: (-history[(m[0] - here[0] + 1) * 3 + (m[1] - here[1] + 1)],
+                                      -popcount(geo.neighbour_masks[geo.index(m)] & free)))
+
+        # Transpozisyon tablosu: yeterince derin kayıt varsa doğrudan kullan,
+        # yoksa en iyi adımını önce dene
+        table = self._transposition_table(main_player)
+        key = board.key(current)
+        entry = table.probe(key)
+        tt_move = None
+        if entry is not None:
+            tt_depth, flag, tt_score, tt_move = entry
+            if tt_depth >= depth:
+                if (flag == EXACT or (flag == LOWER and tt_score >= beta)
+                        or (flag == UPPER and tt_score <= alpha)):
+                    return tt_score
+            if tt_move is not None and tt_move[0] in val_moves:
+                val_moves.remove(tt_move[0])
+                val_moves.insert(0, tt_move[0])
+
+        alpha0, beta0 = alpha, beta
+        value = float('-inf') if maximizing else float('inf')
+        best = None
+        for mv in val_moves:
+            if time.time()-start_time>time_limit:
+                self._search_timed_out = True
+                break
+            board.push(current, mv, None)
+            sc, obs = self._pvs_child(self._obstacle_ply, best is not None, board, depth,
+                                      maximizing, main_player, alpha, beta, start_time, time_limit)
+            board.pop()
+            if obs is None:
+                continue
+            if maximizing:
+                if sc > value:
+                    value = sc
+                    best = (mv, obs)
+                alpha = max(alpha, value)
+            else:
+                if sc < value:
+                    value = sc
+                    best = (mv, obs)
+                beta = min(beta, value)
+            if beta<=alpha:
+                self._record_cutoff(current, depth, self._root_depth - depth,
+                                    step_from=here, step_to=mv)
+                break
+
+        if best is None:
+            if self._search_timed_out:
+                # Süre doldu (adım ya da engel katmanı yarıda kaldı): kayıp
+                # değil, sonuç zaten atılacak
+                return self._evaluate_board(board, main_player)
+            # Tüm adımlar denendi, her adımda engeller kendini ablukaya sokuyor
+            return -999999 if current==main_player else 999999
+        if not self._search_timed_out:
+            if value <= alpha0:
+                flag = UPPER
+            elif value >= beta0:
+                flag = LOWER
+            else:
+                flag = EXACT
+            table.store(key, depth, flag, value, best)
+        return value
+
+    def _pvs_child(self, search, pv_found, board, depth, maximizing, main_player,
+                   alpha, beta, start_time, time_limit, searcher=None):
+        """
+        PVS: ilk (PV) çocuk tam pencereyle aranır; sonrakiler sıfır
+        pencereyle sınanır ve sınır aşılırsa tam pencereyle yeniden aranır.
+        searcher, çocuğu arayan düğümün maksimize edip etmediği (verilmezse
+        maximizing ile aynı: engel katmanı adımı atan oyuncunundur).
+        search'ün dönüşü aynen döndürülür (skor ya da (skor, engel)).
+        """
+        if searcher is None:
+            searcher = maximizing
+        null = None
+        if pv_found:
+            if searcher and alpha > float('-inf'):
+                null = (alpha, alpha + 1)
+            elif not searcher and beta < float('inf'):
+                null = (beta - 1, beta)
+        if null is None:
+            return search(board, depth, maximizing, main_player, alpha, beta, start_time, time_limit)
+        self.search_stats['pvs_null_windows'] += 1
+        result = search(board, depth, maximizing, main_player, null[0], null[1], start_time, time_limit)
+        sc = result[0] if isinstance(result, tuple) else result
+        if alpha < sc < beta:
+            self.search_stats['pvs_researches'] += 1
+            result = search(board, depth, maximizing, main_player, alpha, beta, start_time, time_limit)
+        return result
+
+    def _obstacle_ply(self, board, depth, maximizing, main_player, alpha, beta, start_time, time_limit):
+        """
+        Engel katmanı: adım atılmış board'da aynı oyuncunun engeli seçilir.
+        Kayıtlar tur anahtarından zobrist_half_turn ile ayrılır. Geç sıradaki
+        sakin engeller önce azaltılmış derinlikte (LMR), son turda pencereye
+        ulaşamayan engeller hiç aranmaz (futility).
+        Dönüş: (skor, en iyi engel); kendini ablukaya sokmayan engel yoksa
+        (skor, None).
+        """
+        self.search_stats['obstacle_nodes'] += 1
+        current = main_player if maximizing else ('W' if main_player=='B' else 'B')
+        opp = ('W' if current=='B' else 'B')
+        win_score = 999999 if maximizing else -999999
+
+        table = self._transposition_table(main_player)
+        key = board.key(current) ^ board.geo.zobrist_half_turn
+        entry = table.probe(key)
+        tt_obs = None
+        if entry is not None:
+            tt_depth, flag, tt_score, tt_obs = entry
+            if tt_depth >= depth and tt_obs is not None:
+                if (flag == EXACT or (flag == LOWER and tt_score >= beta)
+                        or (flag == UPPER and tt_score <= alpha)):
+                    return tt_score, tt_obs
+
+        ply = self._root_depth - depth
+        empties = self._order_obstacles(board, current, ply, tt_obs)
+
+        # Sınır düğümü: adım sonrası değerlendirme + pay bile pencereye
+        # ulaşamıyorsa sadece kesin kazanç aranır (rakibi hemen ablukaya
+        # alan ya da taşları kazanılmış oyun sonuna ayıran engel). Bu sınır
+        # tahmin olduğundan sonuç tabloya yazılmaz.
+        futile = None
+        if self.use_futility and depth == 1:
+            static = self._evaluate_board(board, main_player)
+            if maximizing and static + self.futility_margin <= alpha:
+                futile = static + self.futility_margin
+            elif not maximizing and static - self.futility_margin >= beta:
+                futile = static - self.futility_margin
+
+        geo = board.geo
+        opp_near = geo.neighbour_masks[board.piece_index(opp)]
+        alpha0, beta0 = alpha, beta
+        value = float('-inf') if maximizing else float('inf')
+        best = None
+        for k, obs in enumerate(empties):
+            if time.time()-start_time>time_limit:
+                self._search_timed_out = True
+                break
+            board.push(current, None, obs)
+            if board.is_abluka(current):
+                board.pop()
+                continue
+            if board.is_abluka(opp):
+                board.pop()
+                table.store(key, depth, EXACT, win_score, obs)
+                return win_score, obs
+            if futile is not None:
+                if not board.same_region():
+                    winner = self.endgame.solve(board, opp, self.endgame_search_budget)
+                    if winner == current:
+                        board.pop()
+                        table.store(key, depth, EXACT, win_score, obs)
+                        return win_score, obs
+                board.pop()
+                self.search_stats['futility_prunes'] += 1
+                if best is None:
+                    best = obs
+                    value = futile
+                continue
+            reduced = (self.use_lmr and depth >= 2 and k >= self.lmr_min_index
+                       and best is not None and not geo.bits[geo.index(obs)] & opp_near)
+            if reduced:
+                # Sıfır pencereyle bir tur sığ arama; pencereyi geçerse azaltma iptal
+                self.search_stats['lmr_reductions'] += 1
+                if maximizing:
+                    sc = self._alpha_beta_minimax(board, depth-2, False, main_player, alpha, alpha + 1,
+                                                  start_time, time_limit)
+                    reduced = sc <= alpha
+                else:
+                    sc = self._alpha_beta_minimax(board, depth-2, True, main_player, beta - 1, beta,
+                                                  start_time, time_limit)
+                    reduced = sc >= beta
+                if not reduced:
+                    self.search_stats['lmr_researches'] += 1
+            if not reduced:
+                sc = self._pvs_child(self._alpha_beta_minimax, best is not None, board, depth-1,
+                                     not maximizing, main_player, alpha, beta, start_time, time_limit,
+                                     searcher=maximizing)
+            board.pop()
+            if maximizing:
+                if sc > value:
+                    value = sc
+                    best = obs
+                alpha = max(alpha, value)
+            else:
+                if sc < value:
+                    value = sc
+                    best = obs
+                beta = min(beta, value)
+            if beta<=alpha:
+                self._record_cutoff(current, depth, ply, obstacle=board.geo.index(obs))
+                break
+
+        if best is not None and futile is None and not self._search_timed_out:
+            if value <= alpha0:
+                flag = UPPER
+            elif value >= beta0:
+                flag = LOWER
+            else:
+                flag = EXACT
+            table.store(key, depth, flag, value, best)
+        return value, best
 
     # -------------------------------
     # HARD => Q-learning
@@ -739,6 +1164,14 @@ class AIPlayer:
                     self.last_move_reasoning = "ML => Riskli ama kazandıran hamle!"
                     return immediate
 
+        # 1b. Zorunlu abluka dizisi: rakibin her cevabına karşı birkaç tur
+        # içinde abluka (sadece zorlayıcı hamleler arandığı için hızlı)
+        forced = self.threats.forced_win(board, player, max_turns=4)
+        if forced:
+            mv, obs, turns = forced
+            self.last_move_reasoning = f"ML => Zorunlu abluka dizisi ({turns} tur)"
+            return mv, obs
+
         val_moves = board.get_valid_moves(player)
         if not val_moves:
             return None, None
@@ -753,6 +1186,7 @@ class AIPlayer:
 
         # 2. TÜM GÜVENLİ HAMLELERİ TOPLA VE DEĞERLENDİR
         safe_moves = []
+        keep = self._root_orbit_filter(board)
         
         for mv in val_moves:
             if time.time() - start_time > time_limit * 0.85:
@@ -769,6 +1203,8 @@ class AIPlayer:
             for obs in empties:
                 if time.time() - start_time > time_limit * 0.92:
                     break
+                if keep and not keep(mv, obs):
+                    continue
                 
                 # Güvenlik kontrolü
                 is_safe, reason = self._is_safe_move(board, player, mv, obs)
@@ -783,6 +1219,11 @@ class AIPlayer:
                     self.last_move_reasoning = "ML => Güvenli direkt abluka"
                     return mv, obs
                 
+                # Kayıp tespiti: rakibin zorunlu abluka dizisi varsa bu hamle
+                # _is_safe_move'un örneklemesini geçse de güvenli değildir
+                if self.threats.forced_win(tb2, opponent, max_turns=2, node_budget=2000):
+                    continue
+                
                 # Q-value
                 nxt = self._state_to_features(tb2, player)
                 qv = self.q_table.get(nxt, 0)
@@ -795,8 +1236,8 @@ class AIPlayer:
                 escape_bonus = escape / 80.0  # 100→80 daha etkili
                 
                 # RAKİBE ZARAR - ULTRA ÖNEMLİ
-                opp_moves_before = len(board.get_valid_moves(opponent))
-                opp_moves_after = len(tb2.get_valid_moves(opponent))
+                opp_moves_before = board.mobility(opponent)
+                opp_moves_after = tb2.mobility(opponent)
                 damage = opp_moves_before - opp_moves_after
                 damage_bonus = damage * 0.15  # Her azalan hamle için bonus
                 
@@ -832,7 +1273,7 @@ class AIPlayer:
                     tb2.place_obstacle(obs)
                     
                     # Esnek: En azından abluka olmamalı ve 2+ hamle kalmalı
-                    if not tb2.is_abluka(player) and len(tb2.get_valid_moves(player)) >= 2:
+                    if not tb2.is_abluka(player) and tb2.mobility(player) >= 2:
                         nxt = self._state_to_features(tb2, player)
                         qv = self.q_table.get(nxt, 0)
                         heur = self._evaluate_board(tb2, player) / 1500.0
@@ -888,6 +1329,7 @@ class AIPlayer:
 
     def game_over_update(self, winner, player):
         """Oyun bitince geriye dönük update."""
+        self.solved_store.save()
         if not self.learning_enabled or not self.current_game_states:
             return
         print("[ML] Oyun sonu öğrenimi başlıyor...")
@@ -939,17 +1381,10 @@ class AIPlayer:
     # Yardımcı Metotlar
     # -------------------------------------
     def _check_immediate_win(self, board, player):
-        opp = ('W' if player=='B' else 'B')
-        moves = board.get_valid_moves(player)
-        for mv in moves:
-            tmp = self._clone_board(board)
-            tmp.move_piece(player, mv)
-            empties = self._get_empty_positions(tmp)
-            for obs in empties:
-                tb2 = self._clone_board(tmp)
-                tb2.place_obstacle(obs)
-                if not tb2.is_abluka(player) and tb2.is_abluka(opp):
-                    return (mv,obs)
+        # Kendini ablukaya sokmayan ve rakibi ablukaya alan ilk tam tur
+        for code in board.iter_turns(player):
+            if code & OPPONENT_ABLUKA:
+                return board.turn_positions(code)
         return None
 
     def _evaluate_board(self, board, main_player):
@@ -957,71 +1392,70 @@ class AIPlayer:
         ULTRA İYİLEŞTİRİLMİŞ tahta değerlendirme fonksiyonu
         Agresif ve dengeli strateji - rakibi ezmeye odaklı
         """
-        my_moves = board.get_valid_moves(main_player)
+        my_moves = board.mobility(main_player)
         if not my_moves:
             return -999999
         opp = ('W' if main_player=='B' else 'B')
-        op_moves = board.get_valid_moves(opp)
+        op_moves = board.mobility(opp)
         if not op_moves:
             return 999999
 
         # 1. MOBİLİTE (Hareket özgürlüğü) - REBALANCED
         # RAKİBİ SINIRLAMAK daha önemli, kendini korumak da önemli ama daha az
-        mobility_score = (len(my_moves) * 30) - (len(op_moves) * 45)  # Rakip daha ağır!
+        mobility_score = (my_moves * 30) - (op_moves * 45)  # Rakip daha ağır!
         
         # Kritik durum: Rakibi çok sınırlandır - DEV BONUS
-        if len(op_moves) <= 2:
+        if op_moves <= 2:
             mobility_score += 400  # Rakip neredeyse ablukada (200→400)
-        elif len(op_moves) <= 3:
+        elif op_moves <= 3:
             mobility_score += 250  # Rakip çok zorlanıyor (yeni)
-        elif len(op_moves) <= 5:
+        elif op_moves <= 5:
             mobility_score += 120   # Rakip zorlanıyor (80→120)
         
         # Kendi durumum kritik mi? - DAHA TOLERANSlı
-        if len(my_moves) <= 2:
+        if my_moves <= 2:
             mobility_score -= 100  # Tehlike ama daha az ceza (150→100)
-        elif len(my_moves) <= 3:
+        elif my_moves <= 3:
             mobility_score -= 30   # Hafif dikkat (50→30)
 
-        # 2. ALAN KONTROLÜ - BFS ile erişilebilir alan - DAHA ÖNEMLİ
-        my_area = self._flood_fill_area(board, main_player)
-        op_area = self._flood_fill_area(board, opp)
-        area_score = (my_area - op_area) * 12  # 8→12
+        # 2-3. BÖLGE KONTROLÜ (Voronoi) - her boş kare ona önce ulaşana
+        # İki ayrı flood fill + çevreleme yerine: ortak kareler iki kez
+        # sayılmaz, taşlar ayrıldıysa her taraf kendi bölgesini alır
+        my_area, op_area = self._voronoi_territory(board, main_player)
+        territory_score = (my_area * 20) - (op_area * 35)  # Rakip daha ağır
         
-        # Alan avantajı büyükse bonus
+        # Bölge avantajı büyükse bonus
         if my_area > op_area * 1.5:
-            area_score += 80  # 50→80
+            territory_score += 80
         
         # Rakibi çok sınırladıysak DEV BONUS
         if op_area < 8:
-            area_score += 150  # Rakibin alanı küçük!
-
-        # 3. ÇEVRELEME (Rakibi sınırlama) - ULTRA BONUS
-        encirclement = self._calculate_encirclement(board, opp) * 18  # 12→18
+            territory_score += 150  # Rakibin bölgesi küçük!
         
-        # Rakip iyice çevriliyorsa büyük bonus
-        if encirclement > 60:
-            encirclement += 200  # 100→200
-        elif encirclement > 40:
-            encirclement += 100  # Yeni ara kademe
+        # Rakibin bölge payı iyice düştüyse (çevreleme) büyük bonus
+        op_share = op_area / max(1, my_area + op_area)
+        if op_share < 0.3:
+            territory_score += 200
+        elif op_share < 0.4:
+            territory_score += 100
 
         # 4. MERKEZ KONTROLÜ - Stratejik pozisyon (dinamik)
-        mp = board.black_pos if main_player=='B' else board.white_pos
-        op = board.black_pos if opp=='B' else board.white_pos
-        c = board.size // 2
+        geo = board.geo
+        mi = board.piece_index(main_player)
+        oi = board.piece_index(opp)
         
         # Merkeze olan uzaklık (Manhattan distance)
-        my_center_dist = abs(mp[0] - c) + abs(mp[1] - c)
-        op_center_dist = abs(op[0] - c) + abs(op[1] - c)
+        my_center_dist = geo.center_distance[mi]
+        op_center_dist = geo.center_distance[oi]
         
         # Oyun başında merkez önemli, sonda daha az
-        game_progress = len(board.obstacles) / 50.0  # 0 ile 1 arası
+        game_progress = board.obstacle_count / 50.0  # 0 ile 1 arası
         center_weight = 20 * (1 - game_progress * 0.6)  # 15→20, Oyun ilerledikçe azal
         center_score = (op_center_dist - my_center_dist) * center_weight
 
         # 5. ENGEL STRATEJİSİ - REBALANCED
-        my_obstacles = self._count_surrounding_obstacles(board, mp)
-        op_obstacles = self._count_surrounding_obstacles(board, op)
+        my_obstacles = popcount(geo.neighbour_masks[mi] & board.obstacle_bits)
+        op_obstacles = popcount(geo.neighbour_masks[oi] & board.obstacle_bits)
         
         # Rakibin etrafında engel iyi, kendi etrafımda kötü
         obstacle_score = (op_obstacles - my_obstacles) * 25  # 18→25
@@ -1033,67 +1467,66 @@ class AIPlayer:
             obstacle_score -= 40  # Yeni - hafif ceza
         
         # Rakip köşede ve etrafı engellerle doluysa çok iyi - ULTRA BONUS
-        if op_obstacles >= 5 and len(op_moves) <= 4:
+        if op_obstacles >= 5 and op_moves <= 4:
             obstacle_score += 180  # 120→180
-        elif op_obstacles >= 4 and len(op_moves) <= 5:
+        elif op_obstacles >= 4 and op_moves <= 5:
             obstacle_score += 90  # Yeni ara kademe
 
         # 6. KÖŞE VE KENAR CEZASI - REBALANCED
         # Köşelerde sıkışmak kötü ama mutlak değil
         corner_penalty = 0
-        edges = [0, board.size - 1]
-        if mp[0] in edges and mp[1] in edges:
+        if geo.is_corner[mi]:
             # Köşedeyim - hamle sayısına göre ceza
-            if len(my_moves) <= 3:
+            if my_moves <= 3:
                 corner_penalty -= 100  # Köşede VE az hamle = kötü
             else:
                 corner_penalty -= 40   # Köşede ama hamle var = idare eder
-        elif mp[0] in edges or mp[1] in edges:
+        elif geo.is_edge[mi]:
             corner_penalty -= 15  # Kenarda olmak biraz kötü (25→15)
         
         # Rakip köşedeyse ULTRA İYİ
-        if op[0] in edges and op[1] in edges:
-            if len(op_moves) <= 3:
+        if geo.is_corner[oi]:
+            if op_moves <= 3:
                 corner_penalty += 100  # Rakip köşede ve sıkışık!
             else:
                 corner_penalty += 50   # Rakip köşede
-        elif op[0] in edges or op[1] in edges:
+        elif geo.is_edge[oi]:
             corner_penalty += 25  # Rakip kenarda (20→25)
 
         # 7. TAKTİKSEL MESAFE - AGRESYONA GÖRE
         # Oyun sonuna doğru rakibe yakın olmak agresif oyunda iyi!
-        distance = abs(mp[0] - op[0]) + abs(mp[1] - op[1])
+        distance = geo.distance[mi][oi]
         distance_score = 0
         
         # Aggression faktörü kullan
         aggression = getattr(self, 'aggression', 0.5)
         
         if aggression > 0.6:  # Agresif mod
-            if distance <= 3 and len(my_moves) >= len(op_moves):
+            if distance <= 3 and my_moves >= op_moves:
                 distance_score += 40  # Yakınım ve avantajlıyım - iyi!
             elif distance >= 6:
                 distance_score -= 20  # Çok uzak - rakibe yetişemem
         else:  # Savunmacı mod
-            if distance <= 2 and len(my_moves) < len(op_moves):
+            if distance <= 2 and my_moves < op_moves:
                 distance_score -= 30  # Yakınım ama dezavantajlıyım
-            elif distance >= 5 and len(op_moves) <= 3:
+            elif distance >= 5 and op_moves <= 3:
                 distance_score += 40  # Uzaktayım ve rakip sıkışık
 
         # 8. YENİ - KAZANMA POTANSYEL: Sonuca ne kadar yakınım?
         win_potential = 0
         
         # Rakibin durumu kötüyse bonus
-        if len(op_moves) <= 3:
+        if op_moves <= 3:
             win_potential += 150
-        elif len(op_moves) <= 5:
+        elif op_moves <= 5:
             win_potential += 70
         
         # Benim durumum iyiyse bonus
-        if len(my_moves) >= 8:
+        if my_moves >= 8:
             win_potential += 50
         
         # Hamle farkı büyükse bonus
-        move_diff = len(my_moves) - len(op_moves)
+        move_diff = my_moves - op_moves
         if move_diff >= 4:
             win_potential += 100
         elif move_diff >= 2:
@@ -1102,8 +1535,7 @@ class AIPlayer:
         # TOPLAM SKOR - YENİ AĞIRLIKLAR
         total = (
             mobility_score * 1.2 +    # En önemli (1.0→1.2)
-            area_score * 1.1 +        # Çok önemli (1.0→1.1)
-            encirclement * 1.15 +     # Çok önemli (1.0→1.15)
+            territory_score * 1.1 +   # Çok önemli (alan + çevreleme)
             center_score * 0.8 +      # Orta önemli (1.0→0.8)
             obstacle_score * 1.0 +    # Önemli
             corner_penalty * 0.9 +    # Orta önemli (1.0→0.9)
@@ -1115,8 +1547,8 @@ class AIPlayer:
 
     def _calculate_win_probability(self, board, player):
         opp = 'W' if player=='B' else 'B'
-        mym = len(board.get_valid_moves(player))
-        opm = len(board.get_valid_moves(opp))
+        mym = board.mobility(player)
+        opm = board.mobility(opp)
         if mym==0: return 5.0
         if opm==0: return 95.0
         ratio = mym/max(1,opm)
@@ -1126,25 +1558,24 @@ class AIPlayer:
 
     def _state_to_features(self, board, player):
         opp = ('W' if player=='B' else 'B')
-        my_pos = board.black_pos if player=='B' else board.white_pos
-        op_pos = board.black_pos if opp=='B' else board.white_pos
+        geo = board.geo
+        mi = board.piece_index(player)
+        oi = board.piece_index(opp)
+        my_pos = geo.cells[mi]
+        op_pos = geo.cells[oi]
 
-        my_moves = len(board.get_valid_moves(player))
-        op_moves = len(board.get_valid_moves(opp))
-        dist = abs(my_pos[0]-op_pos[0]) + abs(my_pos[1]-op_pos[1])
-        obstacle_ratio = min(9, len(board.obstacles)//(board.size*board.size//10))
+        my_moves = board.mobility(player)
+        op_moves = board.mobility(opp)
+        dist = geo.distance[mi][oi]
+        obstacle_ratio = min(9, board.obstacle_count//(board.size*board.size//10))
 
-        my_obs = self._count_surrounding_obstacles(board,my_pos)
-        op_obs = self._count_surrounding_obstacles(board,op_pos)
+        my_obs = popcount(geo.neighbour_masks[mi] & board.obstacle_bits)
+        op_obs = popcount(geo.neighbour_masks[oi] & board.obstacle_bits)
 
-        c = board.size//2
-        my_c = abs(my_pos[0]-c)+abs(my_pos[1]-c)
-        op_c = abs(op_pos[0]-c)+abs(op_pos[1]-c)
-        center_diff = min(3,max(-3,op_c-my_c))
+        center_diff = min(3,max(-3,geo.center_distance[oi]-geo.center_distance[mi]))
         enc = min(9,int(self._calculate_encirclement(board,opp)/10))
 
-        edge_dist = min(my_pos[0],my_pos[1],board.size-1-my_pos[0],board.size-1-my_pos[1])
-        edge_dist = min(3,edge_dist)
+        edge_dist = min(3,geo.edge_distance[mi])
 
         nr_my_r = min(4,my_pos[0]*5//board.size)
         nr_my_c = min(4,my_pos[1]*5//board.size)
@@ -1256,55 +1687,26 @@ class AIPlayer:
     # ----------------------------------------------------
     # Yardımcı
     # ----------------------------------------------------
-    def _flood_fill_area(self, board, player):
-        start = board.black_pos if player=='B' else board.white_pos
-        visited=set()
-        stack=[start]
-        cnt=0
-        while stack:
-            r,c = stack.pop()
-            if (r,c) in visited:
-                continue
-            visited.add((r,c))
-            cell = board.grid[r][c]
-            if cell is None or cell==player:
-                cnt+=1
-                for dr,dc in [(-1,0),(1,0),(0,-1),(0,1),(-1,-1),(1,1),(-1,1),(1,-1)]:
-                    rr=r+dr
-                    cc=c+dc
-                    if 0<=rr<board.size and 0<=cc<board.size:
-                        if (rr,cc) not in visited:
-                            c2 = board.grid[rr][cc]
-                            if c2 is None or c2==player:
-                                stack.append((rr,cc))
-        return cnt
+    def _voronoi_territory(self, board, player):
+        """(player'ın Voronoi kare sayısı, rakibinki) - bkz. Geometry.voronoi"""
+        mine = board.black_bits if player == 'B' else board.white_bits
+        theirs = board.white_bits if player == 'B' else board.black_bits
+        own, opp_own = board.geo.voronoi(mine, theirs, board.free_bits)
+        return popcount(own), popcount(opp_own)
 
     def _calculate_encirclement(self, board, opponent):
-        opp_pos = board.black_pos if opponent=='B' else board.white_pos
-        reach = self._flood_fill_area(board, opponent)
-        total_free = board.size*board.size - len(board.obstacles)
+        reach = board.reachable_area(opponent)
+        total_free = board.size*board.size - board.obstacle_count
         enc = 1.0 - (reach/max(1,total_free))
         return enc*100
 
     def _count_surrounding_obstacles(self, board, pos):
-        r,c = pos
-        cnt=0
-        for dr,dc in [(-1,0),(1,0),(0,-1),(0,1),(-1,-1),(1,1),(-1,1),(1,-1)]:
-            rr=r+dr
-            cc=c+dc
-            if 0<=rr<board.size and 0<=cc<board.size:
-                cell = board.grid[rr][cc]
-                if cell=='X' or cell=='R':
-                    cnt+=1
-        return cnt
+        geo = board.geo
+        return popcount(geo.neighbour_masks[geo.index(pos)] & board.obstacle_bits)
 
     def _get_empty_positions(self, board):
-        em=[]
-        for r in range(board.size):
-            for c in range(board.size):
-                if board.grid[r][c] is None:
-                    em.append((r,c))
-        return em
+        # Ölü kareler (iki taşın da ulaşamadığı) tek "pas" engeline indirilir
+        return board.empty_positions(collapse_dead_cells=True)
 
     def _prune_moves(self, board, player, moves, limit):
         scored=[]
@@ -1323,9 +1725,17 @@ class AIPlayer:
         """
         scored = []
         opp = ('W' if player == 'B' else 'B')
-        base_opm = len(board.get_valid_moves(opp))
-        opp_pos = board.black_pos if opp == 'B' else board.white_pos
-        my_pos = board.black_pos if player == 'B' else board.white_pos
+        base_opm = board.mobility(opp)
+        geo = board.geo
+        opp_idx = board.piece_index(opp)
+        my_idx = board.piece_index(player)
+        opp_pos = geo.cells[opp_idx]
+        opp_targets = geo.neighbours[opp_idx]
+        obstacle_bits = board.obstacle_bits
+        # Rakibe yakın köşeler ve rakibin köşeye uzaklığı
+        near_corners = [(k, geo.distance[opp_idx][k]) for k in geo.corners
+                        if geo.distance[opp_idx][k] <= 5]
+        opp_to_center = geo.center_distance[opp_idx]
         
         # Maksimum stratejik mesafe - zorluk seviyesine göre
         if self.difficulty == 'hard':
@@ -1335,25 +1745,38 @@ class AIPlayer:
         else:
             MAX_STRATEGIC_DISTANCE = 3  # Kolay: 3 kare (daha dar)
         
+        # Engelden bağımsız değerler döngü dışında bir kez hesaplanır
+        total_obstacles = board.obstacle_count
+        # Rakibin alanı ve kesme noktaları: her adayın alanı ne kadar
+        # küçülttüğü tek DFS ile kesin olarak bilinir (aday başına flood yok)
+        _, opp_reach, opp_cuts = board.choke_points(opp)
+        
         for e in empties:
+            ei = e[0] * board.size + e[1]
+            e_dist = geo.distance[ei]
+            
             # Rakibe olan mesafe
-            dist_to_opp = abs(e[0] - opp_pos[0]) + abs(e[1] - opp_pos[1])
+            dist_to_opp = e_dist[opp_idx]
             
             # ÇOK UZAKSA REDDET
             if dist_to_opp > MAX_STRATEGIC_DISTANCE:
                 continue
             
-            tb = self._clone_board(board)
-            tb.place_obstacle(e)
+            # Engeli yerinde koy, engel sonrası değerleri topla, geri al
+            board.push(player, None, e)
             
             # Kendimi ablukaya sokuyorum mu?
-            if tb.is_abluka(player):
+            if board.is_abluka(player):
+                board.pop()
                 continue
             
+            after_op = board.mobility(opp)
+            general_eval = self._evaluate_board(board, player)
+            board.pop()
+            
             score = 0
             
             # 1. RAKİBİN HAMLE SAYISINI AZALT - ULTRA ÖNEMLİ
-            after_op = len(tb.get_valid_moves(opp))
             mobility_reduction = base_opm - after_op
             score += mobility_reduction * 200  # 150→200 DAHA YÜKSEK!
             
@@ -1382,7 +1805,7 @@ class AIPlayer:
                 score += 10   # Uzak ama kabul edilebilir (yeni)
             
             # 3. BENDEN UZAK engeller tercih et - REBALANCED
-            dist_to_me = abs(e[0] - my_pos[0]) + abs(e[1] - my_pos[1])
+            dist_to_me = e_dist[my_idx]
             if dist_to_me >= 4:
                 score += 60  # Benden çok uzak (40→60)
             elif dist_to_me >= 3:
@@ -1400,50 +1823,30 @@ class AIPlayer:
             blocking_value = 0
             
             # Rakibin olası hamle pozisyonlarını kontrol et
-            for dr in [-1, 0, 1]:
-                for dc in [-1, 0, 1]:
-                    if dr == 0 and dc == 0:
-                        continue
-                    
-                    target_r = opp_pos[0] + dr
-                    target_c = opp_pos[1] + dc
-                    
-                    if (0 <= target_r < board.size and 
-                        0 <= target_c < board.size):
-                        dist_to_target = abs(e[0] - target_r) + abs(e[1] - target_c)
-                        if dist_to_target == 0:
-                            blocking_value += 100  # Direkt hamle pozisyonunu tıkıyoruz!
-                        elif dist_to_target <= 1:
-                            blocking_value += 60  # Bu hamle yolunu tıkıyor (50→60)
+            for t in opp_targets:
+                dist_to_target = e_dist[t]
+                if dist_to_target == 0:
+                    blocking_value += 100  # Direkt hamle pozisyonunu tıkıyoruz!
+                elif dist_to_target <= 1:
+                    blocking_value += 60  # Bu hamle yolunu tıkıyor (50→60)
             
             score += blocking_value
             
             # 5. KÖŞEYE İTMEK - AGRESYF
-            corners = [(0, 0), (0, board.size-1), (board.size-1, 0), (board.size-1, board.size-1)]
             best_corner_push = 0
             
-            for corner in corners:
-                corner_dist_opp = abs(opp_pos[0] - corner[0]) + abs(opp_pos[1] - corner[1])
-                
-                # Rakip köşeye yakınsa
-                if corner_dist_opp <= 5:  # 4→5 daha geniş
-                    corner_dist_obs = abs(e[0] - corner[0]) + abs(e[1] - corner[1])
-                    
-                    # Engel, rakiple köşe arasındaysa
-                    if corner_dist_obs < corner_dist_opp:
-                        push_value = 120 - (corner_dist_opp * 12)  # 80→120, daha değerli
-                        best_corner_push = max(best_corner_push, push_value)
+            # Rakibin yakın olduğu köşeler (<= 5, 4→5 daha geniş)
+            for corner, corner_dist_opp in near_corners:
+                # Engel, rakiple köşe arasındaysa
+                if e_dist[corner] < corner_dist_opp:
+                    push_value = 120 - (corner_dist_opp * 12)  # 80→120, daha değerli
+                    best_corner_push = max(best_corner_push, push_value)
             
             score += best_corner_push
             
             # 6. GEÇİT KAPATMA - ULTRA BONUS
             if dist_to_opp <= 4:  # 3→4 daha geniş
-                neighbors_with_obstacles = 0
-                for dr, dc in [(-1, 0), (1, 0), (0, -1), (0, 1)]:
-                    nr, nc = e[0] + dr, e[1] + dc
-                    if 0 <= nr < board.size and 0 <= nc < board.size:
-                        if board.grid[nr][nc] in ('X', 'R'):
-                            neighbors_with_obstacles += 1
+                neighbors_with_obstacles = popcount(geo.orthogonal_masks[ei] & obstacle_bits)
                 
                 if neighbors_with_obstacles >= 3:
                     score += 180  # Çok dar geçit! (yeni)
@@ -1453,21 +1856,16 @@ class AIPlayer:
                     score += 50   # Duvar oluşturma (40→50)
             
             # 7. MERKEZ KONTROLÜ - Dinamik
-            total_obstacles = len(board.obstacles)
+            obs_to_center = geo.center_distance[ei]
             if total_obstacles < 20:  # Oyun başı/ortası (15→20)
-                center = board.size // 2
-                opp_to_center = abs(opp_pos[0] - center) + abs(opp_pos[1] - center)
-                
                 if opp_to_center > 3:
                     # Rakip merkeze uzak, merkezi kontrol et
-                    obs_to_center = abs(e[0] - center) + abs(e[1] - center)
                     if obs_to_center <= 2:
                         score += 40  # Merkezi kontrol et (30→40)
                     elif obs_to_center <= 3:
                         score += 20  # Merkeze yakın (yeni)
                 else:
                     # Rakip merkezdeyse, onu sıkıştır (merkeze engel koyma)
-                    obs_to_center = abs(e[0] - center) + abs(e[1] - center)
                     if obs_to_center >= 3:
                         score += 30  # Merkezden uzak engel, rakibi daralt
             
@@ -1476,24 +1874,22 @@ class AIPlayer:
             if total_obstacles >= 10:  # Oyun ilerlediyse
                 # Engel tahtayı kritik noktada mı böler?
                 # Basit heuristik: Merkeze yakın ve rakibe yakın
-                center = board.size // 2
-                obs_to_center = abs(e[0] - center) + abs(e[1] - center)
-                
                 if obs_to_center <= 2 and dist_to_opp <= 3:
                     # Bu engel tahtayı bölme potansiyeli var
                     score += 100  # Alan bölme bonusu
             
             # 9. YENİ - RAKİBİN ALAN ERİŞİMİNİ AZALT
             # Bu engelden sonra rakibin erişebileceği alan ne kadar azalıyor?
-            opp_area_before = self._flood_fill_area(board, opp)
-            opp_area_after = self._flood_fill_area(tb, opp)
-            area_reduction = opp_area_before - opp_area_after
+            # Kesme noktası ise kopan parça da kaybedilir (bkz. choke_points)
+            if opp_reach & geo.bits[ei]:
+                area_reduction = 1 + opp_cuts.get(ei, 0)
+            else:
+                area_reduction = 0
             
             if area_reduction > 0:
                 score += area_reduction * 15  # Her kare için bonus (yeni!)
             
             # 10. GENEL POZİSYON DEĞERLENDİRMESİ - Az etki
-            general_eval = self._evaluate_board(tb, player)
             score += general_eval / 40.0  # 30→40, daha az etki
             
             scored.append((e, score))
@@ -1515,25 +1911,45 @@ class AIPlayer:
         
         return [x[0] for x in scored[:top_k]]
 
+    def _root_orbit_filter(self, board):
+        """
+        Kökte simetrik tekrarları eleyen süzgeç.
+        Pozisyon bir tahta simetrisiyle değişmiyorsa (ör. başlangıç pozisyonu
+        sol-sağ aynası), birbirinin aynası olan (hamle, engel) çiftleri aynı
+        değeri alır; dönen keep(hamle, engel) her yörüngenin sadece ilk
+        görülen çiftinde True verir. Simetrik değilse None döner.
+        """
+        geo = board.geo
+        syms = geo.stabilizer(board.obstacle_bits, board.piece_index('B'), board.piece_index('W'))
+        if len(syms) == 1:
+            return None
+        perms = [geo.sym_perm[sym] for sym in syms[1:]]
+        size = board.size
+        seen = set()
+
+        def keep(mv, obs):
+            m = mv[0] * size + mv[1]
+            o = obs[0] * size + obs[1]
+            orbit_key = min([(m, o)] + [(p[m], p[o]) for p in perms])
+            if orbit_key in seen:
+                return False
+            seen.add(orbit_key)
+            return True
+
+        return keep
+
     def _clone_board(self, board):
-        from abluka.game_logic import Board
-        clone = Board()
-        clone.size = board.size
-        clone.grid = [row[:] for row in board.grid]
-        clone.black_pos = board.black_pos
-        clone.white_pos = board.white_pos
-        clone.obstacles = board.obstacles.copy()
-        return clone
+        return board.copy()
     
     def _is_corner_position(self, pos, board_size):
         """Köşe pozisyonu mu kontrol et"""
-        row, col = pos
-        return (row in [0, board_size - 1]) and (col in [0, board_size - 1])
+        geo = get_geometry(board_size)
+        return geo.is_corner[geo.index(pos)]
     
     def _is_edge_position(self, pos, board_size):
         """Kenar pozisyonu mu kontrol et"""
-        row, col = pos
-        return row in [0, board_size - 1] or col in [0, board_size - 1]
+        geo = get_geometry(board_size)
+        return geo.is_edge[geo.index(pos)]
     
     def _is_safe_move(self, board, player, move_pos, obstacle_pos):
         """
@@ -1546,10 +1962,9 @@ class AIPlayer:
         4. Gelecek turları simüle et (akıllıca)
         5. Risk-getiri dengesi
         """
-        # Hamleyi simüle et
-        test_board = self._clone_board(board)
-        test_board.move_piece(player, move_pos)
-        test_board.place_obstacle(obstacle_pos)
+        # Hamleyi simüle et (tek kopya; ileri turlar push/pop ile denenir)
+        test_board = board.copy()
+        test_board.push(player, move_pos, obstacle_pos)
         
         opponent = 'W' if player == 'B' else 'B'
         
@@ -1591,7 +2006,7 @@ class AIPlayer:
                 # AMA: Eğer rakibi de köşeye sıkıştırıyorsam...
                 opp_pos = test_board.black_pos if opponent == 'B' else test_board.white_pos
                 if self._is_corner_position(opp_pos, board.size):
-                    opp_moves_after = len(test_board.get_valid_moves(opponent))
+                    opp_moves_after = test_board.mobility(opponent)
                     if opp_moves_after < corner_moves:
                         pass  # Rakip daha kötü durumda, kabul et
                     else:
@@ -1605,7 +2020,7 @@ class AIPlayer:
             
             if len(my_moves) < edge_threshold:
                 # Rakibin durumunu kontrol et
-                opp_moves_after = len(test_board.get_valid_moves(opponent))
+                opp_moves_after = test_board.mobility(opponent)
                 if opp_moves_after <= 4:
                     pass  # Rakip de zorlanıyor, kabul et
                 else:
@@ -1642,33 +2057,34 @@ class AIPlayer:
             
             # Rakibin beni en çok sıkıştıran hamlesini bul
             worst_case_my_moves = len(my_moves)
-            worst_scenario_board = None
+            worst_scenario = None
+            worst_opp_moves = 0
             
             # İlk N hamleyi kontrol et (zorluk seviyesine göre)
             check_count = min(len(opp_moves), 3 if self.difficulty == 'easy' else 5)
             
             for opp_move in opp_moves[:check_count]:
-                temp_b = self._clone_board(test_board)
-                temp_b.move_piece(opponent, opp_move)
-                empties = self._get_empty_positions(temp_b)
+                test_board.push(opponent, opp_move, None)
+                empties = self._get_empty_positions(test_board)
                 
                 # İlk 8 engeli kontrol et
                 for obs in empties[:8]:
-                    temp_b2 = self._clone_board(temp_b)
-                    temp_b2.place_obstacle(obs)
+                    test_board.push(opponent, None, obs)
                     
-                    future_my_moves = len(temp_b2.get_valid_moves(player))
+                    future_my_moves = test_board.mobility(player)
                     
                     if future_my_moves < worst_case_my_moves:
                         worst_case_my_moves = future_my_moves
-                        worst_scenario_board = temp_b2
+                        worst_scenario = (opp_move, obs)
+                        worst_opp_moves = test_board.mobility(opponent)
                         
                         # Eğer ablukaya giriyorsam direkt ret
-                        if worst_case_my_moves == 0:
-                            # AMA: Rakip de ablukaya giriyorsa?
-                            if temp_b2.is_abluka(opponent):
-                                continue  # Berabere, devam et
+                        # AMA: Rakip de ablukaya giriyorsa berabere, devam et
+                        if worst_case_my_moves == 0 and worst_opp_moves > 0:
                             return False, f"Gelecek tur {future_turn + 1}'de abluka riski"
+                    
+                    test_board.pop()
+                test_board.pop()
             
             # Gelecek turda çok az hamlem kalıyor mu?
             # Zorluk seviyesine göre minimum
@@ -1676,26 +2092,24 @@ class AIPlayer:
             
             if worst_case_my_moves < future_min:
                 # Rakibin durumunu da kontrol et
-                if worst_scenario_board:
-                    opp_future_moves = len(worst_scenario_board.get_valid_moves(opponent))
-                    
+                if worst_scenario:
                     # Eğer rakip de sıkışıyorsa kabul et
-                    if opp_future_moves <= worst_case_my_moves + 1:
+                    if worst_opp_moves <= worst_case_my_moves + 1:
                         pass  # Rakip benimle aynı durumda veya daha kötü
                     else:
                         return False, f"Gelecek tur {future_turn + 1}'de risk ({worst_case_my_moves} hamle)"
             
             # Bir sonraki tur için tahtayı güncelle
-            if worst_scenario_board:
-                test_board = worst_scenario_board
+            if worst_scenario:
+                test_board.push(opponent, worst_scenario[0], worst_scenario[1])
                 my_moves = test_board.get_valid_moves(player)
                 if not my_moves:
                     return False, f"Gelecek tur {future_turn + 1}'de abluka"
         
         # 7. YENİ - RİSK-GETİRİ ANALİZİ
         # Bu hamle riskli ama rakibe çok zarar veriyorsa kabul et
-        opp_moves_before = len(board.get_valid_moves(opponent))
-        opp_moves_after = len(test_board.get_valid_moves(opponent))
+        opp_moves_before = board.mobility(opponent)
+        opp_moves_after = test_board.mobility(opponent)
         damage_to_opponent = opp_moves_before - opp_moves_after
         
         # Eğer rakibe 3+ hamle kaybettiriyorsam ve benim 2+ hamlem varsa
@@ -1710,34 +2124,23 @@ class AIPlayer:
         """
         Kaçış yollarını değerlendir - açık alanlara giden yollar
         """
-        my_pos = board.black_pos if player == 'B' else board.white_pos
-        center = board.size // 2
+        geo = board.geo
+        my_idx = board.piece_index(player)
+        free = board.free_bits
         
         escape_value = 0
         
         # Merkeze açık yol var mı?
-        if abs(my_pos[0] - center) <= 2 and abs(my_pos[1] - center) <= 2:
+        if geo.center_near[my_idx]:
             escape_value += 50  # Merkezdeyiz, iyi
         
-        # Her yöne kaç adım gidebilirim?
-        directions = [(-1, 0), (1, 0), (0, -1), (0, 1), (-1, -1), (1, 1), (-1, 1), (1, -1)]
-        
-        for dr, dc in directions:
+        # Her yöne kaç adım gidebilirim? (3 adım ileriye bak)
+        for ray in geo.rays[my_idx]:
             steps = 0
-            r, c = my_pos
-            
-            for _ in range(3):  # 3 adım ileriye bak
-                r += dr
-                c += dc
-                
-                if 0 <= r < board.size and 0 <= c < board.size:
-                    if board.grid[r][c] is None:
-                        steps += 1
-                    else:
-                        break
-                else:
+            for j in ray:
+                if not (free >> j) & 1:
                     break
-            
+                steps += 1
             escape_value += steps * 10
         
         return escape_value
@@ -1752,8 +2155,8 @@ class AIPlayer:
 
     def _assess_emotion(self, board, player):
         opp = ('W' if player=='B' else 'B')
-        my_m = len(board.get_valid_moves(player))
-        op_m = len(board.get_valid_moves(opp))
+        my_m = board.mobility(player)
+        op_m = board.mobility(opp)
         if self.last_mobility is not None and my_m<self.last_mobility:
             self.current_message = self._random_reaction(self.emojis['worried'], self.messages['worried'])
         elif op_m==0:
@@ -0,0 +1,241 @@
+"""
+Abluka çekirdek performans ölçümleri.
+
+Kullanım:
+    python -m abluka.benchmark board      # Board başına bellek ve oluşturma hızı
+    python -m abluka.benchmark turns      # Tam tur (adım + engel) üretim hızı
+    python -m abluka.benchmark playouts   # Tek çekirdekte rastgele oyun hızı
+    python -m abluka.benchmark search     # LMR + sınır budaması / budamasız arama
+"""
+
+import argparse
+import contextlib
+import io
+import random
+import sys
+import time
+
+from abluka.bitboard import Geometry
+from abluka.game_logic import Board
+from abluka.playout import random_playout
+
+
+def _deep_sizeof(obj, seen=None):
+    """
+    Nesnenin kendisi + sahip olduğu alt nesnelerin toplam boyutu (bayt).
+    Tahta boyutuna göre paylaşılan Geometry tabloları sayılmaz.
+    """
+    if seen is None:
+        seen = set()
+    if id(obj) in seen or isinstance(obj, Geometry):
+        return 0
+    seen.add(id(obj))
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        for k, v in obj.items():
+            size += _deep_sizeof(k, seen) + _deep_sizeof(v, seen)
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        for item in obj:
+            size += _deep_sizeof(item, seen)
+    if hasattr(obj, '__dict__'):
+        size += _deep_sizeof(vars(obj), seen)
+    for cls in type(obj).__mro__:
+        for name in getattr(cls, '__slots__', ()):
+            if hasattr(obj, name):
+                size += _deep_sizeof(getattr(obj, name), seen)
+    return size
+
+
+def _rate(func, count):
+    """func'ı count kez çağırıp saniyedeki çağrı sayısını döndürür."""
+    start = time.perf_counter()
+    for _ in range(count):
+        func()
+    return count / (time.perf_counter() - start)
+
+
+def bench_board(count):
+    """Board başına bayt ve saniyede oluşturulan/kopyalanan tahta sayısı."""
+    fresh = Board()
+
+    # Orta oyun benzeri bir tahta: 20 engel
+    mid = Board()
+    for pos in mid.empty_positions()[:20]:
+        mid.place_obstacle(pos)
+
+    results = {
+        'bytes_per_board_start': _deep_sizeof(fresh),
+        'bytes_per_board_mid': _deep_sizeof(mid),
+        'boards_created_per_sec': _rate(Board, count),
+        'boards_copied_per_sec': _rate(mid.copy, count),
+    }
+    print("[BENCH] Board")
+    print(f"  Bayt/Board (başlangıç)  : {results['bytes_per_board_start']}")
+    print(f"  Bayt/Board (20 engel)   : {results['bytes_per_board_mid']}")
+    print(f"  Board() / sn            : {results['boards_created_per_sec']:,.0f}")
+    print(f"  Board.copy() / sn       : {results['boards_copied_per_sec']:,.0f}")
+    return results
+
+
+def _midgame_board(obstacles=20):
+    """Ölçümler için sabit bir orta oyun tahtası."""
+    board = Board()
+    board.move_piece('B', (1, 3))
+    board.move_piece('W', (5, 2))
+    for pos in board.empty_positions()[::2][:obstacles]:
+        board.place_obstacle(pos)
+    return board
+
+
+def bench_turns(count):
+    """Board.iter_turns ile saniyede üretilen tam tur sayısı."""
+    results = {}
+    print("[BENCH] Tam tur üretimi")
+    for name, board in (('başlangıç', Board()), ('orta oyun', _midgame_board())):
+        n = len(list(board.iter_turns('B')))
+        rate = _rate(lambda: sum(1 for _ in board.iter_turns('B')), count)
+        results[name] = rate * n
+        print(f"  {name:<10}: {n} tur/pozisyon, {rate * n:,.0f} tur/sn")
+    return results
+
+
+def bench_playouts(count, seed):
+    """random_playout ile saniyedeki playout sayısı (tek çekirdek, tohumlu)."""
+    results = {}
+    print("[BENCH] Rastgele oyun (playout)")
+    for name, board in (('başlangıç', Board()), ('orta oyun', _midgame_board())):
+        rng = random.Random(seed)
+        geo = board.geo
+        obstacles = board.obstacle_bits
+        black, white = board.piece_index('B'), board.piece_index('W')
+        turns = 0
+        black_wins = 0
+        start = time.perf_counter()
+        for _ in range(count):
+            winner, length = random_playout(geo, obstacles, black, white, True, rng)
+            turns += length
+            black_wins += winner == 'B'
+        rate = count / (time.perf_counter() - start)
+        results[name] = rate
+        print(f"  {name:<10}: {rate:,.0f} playout/sn, ortalama {turns / count:.1f} tur, "
+              f"siyah %{100 * black_wins / count:.0f}")
+    return results
+
+
+def _search_suite(count, seed):
+    """
+    Sabit pozisyon seti: boş tahtadan tohumlu rastgele 4-20 tur oynanmış,
+    iki tarafın da hamlesi kalan count pozisyon (sıradaki oyuncuyla).
+    """
+    rng = random.Random(seed)
+    suite = []
+    while len(suite) < count:
+        board = Board()
+        side = 'B'
+        for _ in range(rng.randint(4, 20)):
+            turns = list(board.iter_turns(side))
+            if not turns:
+                break
+            board.push(side, *board.turn_positions(rng.choice(turns)))
+            side = 'W' if side == 'B' else 'B'
+        if board.get_valid_moves('B') and board.get_valid_moves('W') \
+                and not board.is_abluka('B') and not board.is_abluka('W'):
+            suite.append((board, side))
+    return suite
+
+
+def bench_search(count, depth, seed, think_time):
+    """
+    Sabit pozisyon setinde LMR ve sınır düğümü budamasının (ayrı ayrı)
+    budamasız alpha-beta ile karşılaştırması: sabit derinlikte aynı hamle
+    sayısı, skor farkı, düğüm sayısı ve süre; ardından think_time saniyede
+    iteratif derinleştirmenin ulaştığı ortalama derinlik.
+    """
+    from abluka.ai_player import AIPlayer
+
+    suite = _search_suite(count, seed)
+    configs = (('budamasız', False, False), ('LMR', True, False), ('futility', False, True))
+    players = {}
+    for name, lmr, futility in configs:
+        ai = AIPlayer('hard', max_time=think_time, log_enabled=False)
+        ai.use_lmr = lmr
+        ai.use_futility = futility
+        players[name] = ai
+
+    results = {name: {'nodes': 0, 'time': 0.0, 'moves': [], 'scores': [], 'depths': []}
+               for name, _, _ in configs}
+    # AIPlayer hata ayıklama çıktıları ölçümü kirletmesin
+    with contextlib.redirect_stdout(io.StringIO()):
+        for board, side in suite:
+            for name, _, _ in configs:
+                ai = players[name]
+                res = results[name]
+                ai.transposition.clear()
+                for counter in ai.search_stats:
+                    ai.search_stats[counter] = 0
+                start = time.perf_counter()
+                mv, obs, score = ai._search_best_move(board, side, depth, time.time(), float('inf'))
+                res['time'] += time.perf_counter() - start
+                res['nodes'] += ai.search_stats['nodes'] + ai.search_stats['obstacle_nodes']
+                res['moves'].append((mv, obs))
+                res['scores'].append(score)
+                if think_time > 0:
+                    ai.transposition.clear()
+                    reached, _ = ai._iterative_deepening(board, side, think_time, time.time())
+                    res['depths'].append(reached)
+
+    base = results['budamasız']
+    print(f"[BENCH] Arama: {count} pozisyon, derinlik {depth}")
+    for name, _, _ in configs:
+        res = results[name]
+        line = f"  {name:<10}: {res['nodes']:,} düğüm, {res['time']:.2f} sn"
+        if res['depths']:
+            line += f", {think_time:g} sn'de ortalama derinlik {sum(res['depths']) / count:.2f}" \
+                    f" (en az {min(res['depths'])})"
+        print(line)
+        if res is base:
+            continue
+        same = sum(a == b for a, b in zip(base['moves'], res['moves']))
+        diffs = [abs(a - b) for a, b in zip(base['scores'], res['scores'])]
+        print(f"  {'':<10}  aynı hamle {same}/{count}, skor farkı ortalama "
+              f"{sum(diffs) / count:.0f} (en çok {max(diffs):.0f}), "
+              f"düğüm oranı {res['nodes'] / max(base['nodes'], 1):.2f}")
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Abluka performans ölçümleri')
+    sub = parser.add_subparsers(dest='bench')
+
+    p_board = sub.add_parser('board', help='Board bellek/oluşturma ölçümü')
+    p_board.add_argument('--count', type=int, default=200000, help='Tekrar sayısı')
+
+    p_turns = sub.add_parser('turns', help='Tam tur üretim hızı')
+    p_turns.add_argument('--count', type=int, default=2000, help='Tekrar sayısı')
+
+    p_playouts = sub.add_parser('playouts', help='Rastgele oyun (playout) hızı')
+    p_playouts.add_argument('--count', type=int, default=20000, help='Playout sayısı')
+    p_playouts.add_argument('--seed', type=int, default=0, help='Rastgele tohum')
+
+    p_search = sub.add_parser('search', help='LMR + sınır budaması doğrulaması')
+    p_search.add_argument('--positions', type=int, default=12, help='Pozisyon sayısı')
+    p_search.add_argument('--depth', type=int, default=3, help='Sabit arama derinliği')
+    p_search.add_argument('--seed', type=int, default=0, help='Rastgele tohum')
+    p_search.add_argument('--time', type=float, default=4.0,
+                          help='Derinleştirme süresi (zor seviye max_time); 0 = ölçme')
+
+    args = parser.parse_args()
+    if args.bench == 'board':
+        bench_board(args.count)
+    elif args.bench == 'turns':
+        bench_turns(args.count)
+    elif args.bench == 'playouts':
+        bench_playouts(args.count, args.seed)
+    elif args.bench == 'search':
+        bench_search(args.positions, args.depth, args.seed, args.time)
+    else:
+        parser.print_help()
+
+
+if __name__ == "__main__":
+    main()
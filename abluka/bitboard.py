@@ -0,0 +1,377 @@
+"""
+Abluka tahtası için bitboard yardımcıları.
+
+Tahtadaki her kare tek bir bit ile temsil edilir: (satır, sütun) karesinin
+indeksi satir * size + sutun'dur. 7x7 tahtada 49 bitlik tam sayılar yeterlidir.
+Komşuluk maskeleri gibi tahta boyutuna bağlı tablolar bir kez hesaplanır ve
+boyuta göre önbelleğe alınır.
+"""
+
+import random
+
+try:
+    popcount = int.bit_count
+except AttributeError:  # Python < 3.10
+    def popcount(x):
+        """Bir tam sayıdaki 1 bitlerinin sayısı."""
+        return bin(x).count('1')
+
+
+# Şah hamlesi yönleri (satır, sütun). Sıra, Board.get_valid_moves'un
+# eskiden döndürdüğü sırayla aynıdır (satır öncelikli).
+KING_DIRECTIONS = [(-1, -1), (-1, 0), (-1, 1),
+                   (0, -1), (0, 1),
+                   (1, -1), (1, 0), (1, 1)]
+
+
+# Tam tur (adım + engel) kodlaması:
+#   bit 0-7  : adım karesi, bit 8-15: engel karesi, bit 16: rakip ablukada
+TURN_SHIFT = 8
+TURN_CELL_MASK = (1 << TURN_SHIFT) - 1
+OPPONENT_ABLUKA = 1 << (2 * TURN_SHIFT)
+
+
+def encode_turn(step, obstacle, flags=0):
+    """(adım indeksi, engel indeksi) -> tek bir tam sayı."""
+    return step | (obstacle << TURN_SHIFT) | flags
+
+
+def decode_turn(code):
+    """Kodlanmış tur -> (adım indeksi, engel indeksi, rakip abluka mı)."""
+    return (code & TURN_CELL_MASK,
+            (code >> TURN_SHIFT) & TURN_CELL_MASK,
+            bool(code & OPPONENT_ABLUKA))
+
+
+# Karenin 8 simetrisi (dihedral grup): (satır, sütun, n-1) -> (satır', sütun')
+SYMMETRIES = (
+    lambda r, c, m: (r, c),            # 0: özdeşlik
+    lambda r, c, m: (r, m - c),        # 1: sol-sağ ayna
+    lambda r, c, m: (m - r, c),        # 2: üst-alt ayna
+    lambda r, c, m: (m - r, m - c),    # 3: 180 derece
+    lambda r, c, m: (c, r),            # 4: ana köşegen
+    lambda r, c, m: (c, m - r),        # 5: 90 derece saat yönü
+    lambda r, c, m: (m - c, r),        # 6: 90 derece saat yönü tersi
+    lambda r, c, m: (m - c, m - r),    # 7: ters köşegen
+)
+
+
+class Geometry:
+    """
+    NxN tahta için önceden hesaplanmış tablolar:
+      - cells          : indeks -> (satır, sütun)
+      - bits           : indeks -> 1 << indeks
+      - neighbours     : indeks -> komşu indeksleri (satır öncelikli sırada)
+      - neighbour_masks: indeks -> komşuların bit maskesi
+      - orthogonal_masks: indeks -> yatay/dikey komşuların bit maskesi
+      - rays           : indeks -> 8 yön için en fazla 3 adımlık kare dizileri
+      - distance       : indeks x indeks Manhattan uzaklık matrisi
+      - center_distance: indeks -> merkeze Manhattan uzaklığı
+      - center_near    : indeks -> merkeze her iki eksende de <= 2 mi
+      - edge_distance  : indeks -> en yakın kenara uzaklık
+      - is_corner / is_edge, corners (köşe indeksleri)
+      - zobrist_*      : 64 bitlik Zobrist anahtarları (engel, siyah, beyaz,
+                         sıra beyazda, adım atıldı/engel bekleniyor)
+      - sym_perm / sym_inverse: simetri -> indeks permütasyonu ve tersi
+      - not_first_col / not_last_col: kaydırmalı genişletmede satır
+                         taşmasını kesen sütun maskeleri
+      - ring_connected : indeks -> {komşu alt maskesi: bağlı mı}; kare
+                         silindiğinde bölgenin bölünüp bölünmediğine hızlı
+                         yerel cevap için
+    """
+
+    def __init__(self, size):
+        self.size = size
+        self.cell_count = size * size
+        self.full_mask = (1 << self.cell_count) - 1
+
+        self.cells = [(i // size, i % size) for i in range(self.cell_count)]
+        self.bits = [1 << i for i in range(self.cell_count)]
+
+        self.neighbours = []
+        self.neighbour_masks = []
+        for r, c in self.cells:
+            nbrs = []
+            mask = 0
+            for dr, dc in KING_DIRECTIONS:
+                rr, cc = r + dr, c + dc
+                if 0 <= rr < size and 0 <= cc < size:
+                    j = rr * size + cc
+                    nbrs.append(j)
+                    mask |= 1 << j
+            self.neighbours.append(tuple(nbrs))
+            self.neighbour_masks.append(mask)
+
+        self.orthogonal_masks = []
+        self.rays = []
+        for r, c in self.cells:
+            mask = 0
+            for dr, dc in ((-1, 0), (1, 0), (0, -1), (0, 1)):
+                rr, cc = r + dr, c + dc
+                if 0 <= rr < size and 0 <= cc < size:
+                    mask |= 1 << (rr * size + cc)
+            self.orthogonal_masks.append(mask)
+
+            rays = []
+            for dr, dc in KING_DIRECTIONS:
+                ray = []
+                rr, cc = r, c
+                for _ in range(3):
+                    rr += dr
+                    cc += dc
+                    if not (0 <= rr < size and 0 <= cc < size):
+                        break
+                    ray.append(rr * size + cc)
+                if ray:
+                    rays.append(tuple(ray))
+            self.rays.append(tuple(rays))
+
+        self.distance = [tuple(abs(r1 - r2) + abs(c1 - c2) for r2, c2 in self.cells)
+                         for r1, c1 in self.cells]
+
+        center = size // 2
+        last = size - 1
+        self.center_index = center * size + center
+        self.center_distance = [abs(r - center) + abs(c - center) for r, c in self.cells]
+        self.center_near = [abs(r - center) <= 2 and abs(c - center) <= 2 for r, c in self.cells]
+        self.edge_distance = [min(r, c, last - r, last - c) for r, c in self.cells]
+        self.is_corner = [r in (0, last) and c in (0, last) for r, c in self.cells]
+        self.is_edge = [r in (0, last) or c in (0, last) for r, c in self.cells]
+        self.corners = [i for i in range(self.cell_count) if self.is_corner[i]]
+
+        first_col = sum(1 << (r * size) for r in range(size))
+        self.not_first_col = self.full_mask & ~first_col
+        self.not_last_col = self.full_mask & ~(first_col << last)
+
+        # Sabit tohumlu üreteç: anahtarlar çalıştırmalar arasında aynı kalır,
+        # böylece diske yazılan tablolar da yeniden kullanılabilir.
+        rng = random.Random(0xAB1C4 + size)
+        self.zobrist_obstacle = [rng.getrandbits(64) for _ in range(self.cell_count)]
+        self.zobrist_black = [rng.getrandbits(64) for _ in range(self.cell_count)]
+        self.zobrist_white = [rng.getrandbits(64) for _ in range(self.cell_count)]
+        self.zobrist_side = rng.getrandbits(64)
+        # Tur iki yarıya bölündüğünde (adım atıldı, engel bekleniyor)
+        self.zobrist_half_turn = rng.getrandbits(64)
+
+        # Simetri tabloları. Maskeler satır satır dönüştürülür: her simetri
+        # ve satır için 2^size girişlik tablo (7x7'de 8 * 7 * 128 giriş).
+        # Aynı şekilde engel Zobrist anahtarı da satır desenlerinden toplanır.
+        m = size - 1
+        row_mask = (1 << size) - 1
+        self.sym_perm = [tuple(r2 * size + c2 for r2, c2 in (f(r, c, m) for r, c in self.cells))
+                         for f in SYMMETRIES]
+        self.sym_inverse = []
+        for perm in self.sym_perm:
+            inv = [0] * self.cell_count
+            for i, j in enumerate(perm):
+                inv[j] = i
+            self.sym_inverse.append(tuple(inv))
+
+        self._row_mask = row_mask
+        self._sym_rows = []
+        for perm in self.sym_perm:
+            rows = []
+            for r in range(size):
+                table = [0] * (row_mask + 1)
+                for pattern in range(1, row_mask + 1):
+                    low = pattern & -pattern
+                    table[pattern] = table[pattern ^ low] | (1 << perm[r * size + low.bit_length() - 1])
+                rows.append(table)
+            self._sym_rows.append(rows)
+        self._zobrist_rows = []
+        for r in range(size):
+            table = [0] * (row_mask + 1)
+            for pattern in range(1, row_mask + 1):
+                low = pattern & -pattern
+                table[pattern] = table[pattern ^ low] ^ self.zobrist_obstacle[r * size + low.bit_length() - 1]
+            self._zobrist_rows.append(table)
+
+        # Halka bağlılık tablosu: bir kare silinince, bölgede kalan komşuları
+        # kendi aralarında (şah komşuluğuyla) bağlıysa bölge bölünmez.
+        self.ring_connected = []
+        for i in range(self.cell_count):
+            nmask = self.neighbour_masks[i]
+            table = {}
+            sub = nmask
+            while True:
+                table[sub] = self._is_connected(sub)
+                if sub == 0:
+                    break
+                sub = (sub - 1) & nmask
+            self.ring_connected.append(table)
+
+    def _is_connected(self, mask):
+        """Maskedeki kareler şah komşuluğuyla tek parça mı? (boş maske: evet)"""
+        if not mask:
+            return True
+        return self.flood(mask & -mask, mask) == mask
+
+    def dilate(self, mask):
+        """
+        Maskeyi bir şah adımı genişletir (maskenin kendisi dahil): önce
+        yatay kaydırma (sütun maskeleriyle satır taşması kesilir), sonra
+        dikey kaydırma. Sonuç tahta dışına taşmaz.
+        """
+        size = self.size
+        row = mask | ((mask << 1) & self.not_first_col) | ((mask >> 1) & self.not_last_col)
+        return (row | (row << size) | (row >> size)) & self.full_mask
+
+    def flood(self, seed, allowed):
+        """
+        seed maskesinden başlayıp yalnızca allowed kareleri üzerinden şah
+        adımlarıyla ulaşılabilen tüm kareler (seed dahil).
+        Bit paralel: her turda bütün sınır tek dilate ile genişletilir.
+        """
+        size = self.size
+        not_first = self.not_first_col
+        not_last = self.not_last_col
+        reach = seed
+        while True:
+            row = reach | ((reach << 1) & not_first) | ((reach >> 1) & not_last)
+            grown = ((row | (row << size) | (row >> size)) & allowed) | reach
+            if grown == reach:
+                return reach
+            reach = grown
+
+    def articulation_points(self, root, allowed):
+        """
+        root karesinden allowed kareleri üzerinden ulaşılan bileşende kesme
+        noktaları (iteratif Tarjan DFS).
+        Dönüş: (bileşen boyutu, bileşen maskesi, {kesme karesi: kopan kare
+        sayısı}). Kesme olmayan bir bileşen karesi silinirse bileşen 1
+        küçülür; kesme karesi v silinirse 1 + kesmeler[v] küçülür.
+        """
+        nbrs = self.neighbours
+        bits = self.bits
+        disc = [-1] * self.cell_count
+        low = [0] * self.cell_count
+        sub = [1] * self.cell_count
+        cuts = {}
+        disc[root] = 0
+        counter = 1
+        reach = bits[root]
+        stack = [(root, 0)]
+        while stack:
+            v, k = stack[-1]
+            nb = nbrs[v]
+            while k < len(nb):
+                w = nb[k]
+                k += 1
+                if not allowed & bits[w]:
+                    continue
+                if disc[w] < 0:
+                    stack[-1] = (v, k)
+                    disc[w] = low[w] = counter
+                    counter += 1
+                    reach |= bits[w]
+                    stack.append((w, 0))
+                    break
+                if disc[w] < low[v]:
+                    low[v] = disc[w]
+            else:
+                stack.pop()
+                if stack:
+                    p = stack[-1][0]
+                    sub[p] += sub[v]
+                    if low[v] < low[p]:
+                        low[p] = low[v]
+                    # v'nin alt ağacı p'nin üstüne geri bağlanamıyor: p kesme
+                    if p != root and low[v] >= disc[p]:
+                        cuts[p] = cuts.get(p, 0) + sub[v]
+        return counter, reach, cuts
+
+    def voronoi(self, seed_a, seed_b, allowed):
+        """
+        İki taraftan eşzamanlı bit paralel BFS: allowed içindeki her kare,
+        ona daha önce ulaşan tarafa yazılır; aynı turda ulaşılanlar tarafsız
+        kalır (ama iki tarafın sınırında da yayılmaya devam eder).
+        Dönüş: (a'nın kareleri, b'nin kareleri) maskeleri, tohumlar hariç.
+        """
+        claimed = seed_a | seed_b
+        front_a, front_b = seed_a, seed_b
+        own_a = own_b = 0
+        while front_a or front_b:
+            new_a = self.dilate(front_a) & allowed & ~claimed
+            new_b = self.dilate(front_b) & allowed & ~claimed
+            own_a |= new_a & ~new_b
+            own_b |= new_b & ~new_a
+            claimed |= new_a | new_b
+            front_a, front_b = new_a, new_b
+        return own_a, own_b
+
+    def transform_mask(self, mask, sym):
+        """Bit maskesine sym numaralı simetriyi uygular."""
+        rows = self._sym_rows[sym]
+        size = self.size
+        row_mask = self._row_mask
+        out = 0
+        r = 0
+        while mask:
+            out |= rows[r][mask & row_mask]
+            mask >>= size
+            r += 1
+        return out
+
+    def obstacle_zobrist(self, mask):
+        """Engel maskesinin Zobrist katkısı (satır tablolarıyla)."""
+        size = self.size
+        row_mask = self._row_mask
+        key = 0
+        r = 0
+        while mask:
+            key ^= self._zobrist_rows[r][mask & row_mask]
+            mask >>= size
+            r += 1
+        return key
+
+    def canonical_form(self, obstacle_bits, black_idx, white_idx):
+        """
+        Pozisyonun 8 simetrisi içinden sözlük sırasına göre en küçüğü.
+        Dönüş: ((engel maskesi, siyah indeks, beyaz indeks), simetri no)
+        Orijinal bir kare i, kanonik çerçevede sym_perm[simetri][i] olur.
+        """
+        best = (obstacle_bits, black_idx, white_idx)
+        best_sym = 0
+        for sym in range(1, 8):
+            perm = self.sym_perm[sym]
+            cand = (self.transform_mask(obstacle_bits, sym), perm[black_idx], perm[white_idx])
+            if cand < best:
+                best = cand
+                best_sym = sym
+        return best, best_sym
+
+    def stabilizer(self, obstacle_bits, black_idx, white_idx):
+        """Pozisyonu değiştirmeyen simetrilerin listesi (özdeşlik dahil)."""
+        syms = [0]
+        for sym in range(1, 8):
+            perm = self.sym_perm[sym]
+            if (perm[black_idx] == black_idx and perm[white_idx] == white_idx
+                    and self.transform_mask(obstacle_bits, sym) == obstacle_bits):
+                syms.append(sym)
+        return syms
+
+    def index(self, pos):
+        """(satır, sütun) -> bit indeksi. Tahta dışı için -1."""
+        r, c = pos
+        if 0 <= r < self.size and 0 <= c < self.size:
+            return r * self.size + c
+        return -1
+
+    def iter_indices(self, mask):
+        """Maskedeki 1 bitlerinin indekslerini küçükten büyüğe üretir."""
+        while mask:
+            low = mask & -mask
+            yield low.bit_length() - 1
+            mask ^= low
+
+
+_GEOMETRY_CACHE = {}
+
+
+def get_geometry(size):
+    """Verilen tahta boyutu için (önbellekli) Geometry nesnesi."""
+    geo = _GEOMETRY_CACHE.get(size)
+    if geo is None:
+        geo = Geometry(size)
+        _GEOMETRY_CACHE[size] = geo
+    return geo
@@ -0,0 +1,220 @@
+"""
+Ayrık bölgeler oyun sonu çözücüsü.
+
+Siyah ve beyaz birbirine artık ulaşamıyorsa oyun bir hayatta kalma yarışına
+döner: her oyuncu kendi bölgesinde adım atar ve engelini rakibin bölgesine
+koyar (rakibin bölgesinden kare silmek, engeli başka yere koymaktan hiçbir
+zaman kötü değildir). Böylece iki bölge bağımsız çözülür:
+
+    h(R, p): p'deki taş önce adım atar, sonra rakip R'den bir kare siler;
+             taşın garanti atabileceği adım sayısı
+    g(R, p): önce rakip bir kare siler, sonra h (rakibin bakış açısı)
+
+Sıradaki oyuncu S, rakibi O ise: S kazanır <=> h(R_S, p_S) > g(R_O, p_O).
+
+Değerler bölge maskesi (bit) + konum anahtarlı, eşik sorgulu ("en az k adım
+atabilir mi?") bir DP ile bulunur; her anahtar için bilinen alt/üst sınırlar
+saklanır. Bölge boyutu sınırı ve düğüm bütçesi aşılırsa sonuç "bilinmiyor"dur.
+"""
+
+from abluka.bitboard import get_geometry, popcount
+
+
+REGION_CAP = 12       # bölge başına en fazla kare (taşın karesi dahil)
+NODE_BUDGET = 20000   # tek çözüm çağrısı için düğüm sınırı
+
+
+class _BudgetExceeded(Exception):
+    pass
+
+
+class EndgameSolver:
+    """
+    Ayrık bölgeler için kesin çözücü. Sınır tabloları çağrılar arasında
+    korunur (aynı bölgeler arama boyunca defalarca görülür).
+    """
+
+    def __init__(self, size=7, region_cap=REGION_CAP, node_budget=NODE_BUDGET,
+                 max_entries=500000):
+        self.geo = get_geometry(size)
+        self.region_cap = region_cap
+        self.node_budget = node_budget
+        self.max_entries = max_entries
+        # (bölge, konum) -> (alt, üst) sınırları
+        self._step_bounds = {}    # h: önce adım
+        self._attack_bounds = {}  # g: önce silme
+        self.nodes = 0
+        self.solved = 0
+        self.unknown = 0
+
+    # ------------------------------------------------
+    # Eşik sorguları
+    # ------------------------------------------------
+    def _component(self, region, removed, pos):
+        """region'dan removed karesi silinince pos'un bileşeni."""
+        geo = self.geo
+        rest = region ^ geo.bits[removed]
+        if geo.ring_connected[removed][geo.neighbour_masks[removed] & rest]:
+            return rest
+        return geo.flood(geo.bits[pos], rest)
+
+    def _tick(self):
+        self.nodes += 1
+        if self.nodes > self._budget_end:
+            raise _BudgetExceeded()
+
+    def _survives(self, region, pos, k):
+        """Önce adım atarak en az k adım garanti edilebilir mi? (h >= k)"""
+        if k <= 0:
+            return True
+        key = (region, pos)
+        lo, hi = self._step_bounds.get(key, (0, popcount(region) - 1))
+        if k <= lo:
+            return True
+        if k > hi:
+            return False
+        self._tick()
+        geo = self.geo
+        steps = geo.neighbour_masks[pos] & region
+        ok = False
+        # Serbest komşusu çok olan kareler önce denenir
+        for q in sorted(geo.iter_indices(steps),
+                        key=lambda j: -popcount(geo.neighbour_masks[j] & region)):
+            if self._holds(region, q, k - 1):
+                ok = True
+                break
+        if ok:
+            lo = k
+        else:
+            hi = k - 1
+        self._step_bounds[key] = (lo, hi)
+        return ok
+
+    def _holds(self, region, pos, k):
+        """Rakip önce bir kare silse bile en az k adım atılabilir mi? (g >= k)"""
+        if k <= 0:
+            return True
+        key = (region, pos)
+        lo, hi = self._attack_bounds.get(key, (0, popcount(region) - 2))
+        if k <= lo:
+            return True
+        if k > hi:
+            return False
+        self._tick()
+        geo = self.geo
+        cells = region & ~geo.bits[pos]
+        near = cells & geo.neighbour_masks[pos]
+        ok = True
+        # Taşın yanındaki silmeler en güçlü cevaplardır; önce onlar
+        for mask in (near, cells & ~near):
+            for d in geo.iter_indices(mask):
+                if not self._survives(self._component(region, d, pos), pos, k):
+                    ok = False
+                    break
+            if not ok:
+                break
+        if ok:
+            lo = k
+        else:
+            hi = k - 1
+        self._attack_bounds[key] = (lo, hi)
+        return ok
+
+    def _exact(self, test, region, pos):
+        """test(region, pos, k) doğru olan en büyük k."""
+        k = 1
+        while test(region, pos, k):
+            k += 1
+        return k - 1
+
+    # ------------------------------------------------
+    # Tahta arayüzü
+    # ------------------------------------------------
+    def _regions(self, board, side_to_move):
+        """Uygulanabilirse (R_S, p_S, R_O, p_O), değilse None."""
+        if board.same_region():
+            return None
+        other = 'W' if side_to_move == 'B' else 'B'
+        my_region = board.region_of(side_to_move)
+        op_region = board.region_of(other)
+        if popcount(my_region) > self.region_cap or popcount(op_region) > self.region_cap:
+            return None
+        if len(self._step_bounds) + len(self._attack_bounds) > self.max_entries:
+            self._step_bounds.clear()
+            self._attack_bounds.clear()
+        return (my_region, board.piece_index(side_to_move),
+                op_region, board.piece_index(other))
+
+    def solve(self, board, side_to_move, node_budget=None):
+        """
+        Taşlar ayrıksa ve bölgeler sınır içindeyse kazanan ('B'/'W'),
+        aksi halde (ya da bütçe aşılırsa) None. node_budget verilmezse
+        varsayılan bütçe kullanılır (arama içinde daha küçük verilir).
+        """
+        regions = self._regions(board, side_to_move)
+        if regions is None:
+            return None
+        my_region, my_pos, op_region, op_pos = regions
+        other = 'W' if side_to_move == 'B' else 'B'
+        self._budget_end = self.nodes + (node_budget or self.node_budget)
+        try:
+            g = self._exact(self._holds, op_region, op_pos)
+            wins = self._survives(my_region, my_pos, g + 1)
+        except _BudgetExceeded:
+            self.unknown += 1
+            return None
+        self.solved += 1
+        return side_to_move if wins else other
+
+    def best_turn(self, board, side_to_move):
+        """
+        Kesin oyun sonu hamlesi: (adım, engel, kazanan) ya da None.
+        Kazanırken rakibi g'nin altında tutan, kaybederken en uzun dayanan
+        adım seçilir; engel her durumda rakibin bölgesini en çok kısaltan
+        kareye konur.
+        """
+        regions = self._regions(board, side_to_move)
+        if regions is None:
+            return None
+        my_region, my_pos, op_region, op_pos = regions
+        other = 'W' if side_to_move == 'B' else 'B'
+        geo = self.geo
+        self._budget_end = self.nodes + self.node_budget
+        try:
+            g = self._exact(self._holds, op_region, op_pos)
+            if self._survives(my_region, my_pos, g + 1):
+                winner, need = side_to_move, g
+            else:
+                winner = other
+                need = self._exact(self._survives, my_region, my_pos) - 1
+            step = None
+            for q in geo.iter_indices(geo.neighbour_masks[my_pos] & my_region):
+                if self._holds(my_region, q, need):
+                    step = q
+                    break
+            obstacle = None
+            cells = op_region & ~geo.bits[op_pos]
+            near = cells & geo.neighbour_masks[op_pos]
+            for mask in (near, cells & ~near):
+                for d in geo.iter_indices(mask):
+                    if not self._survives(self._component(op_region, d, op_pos), op_pos, g + 1):
+                        obstacle = d
+                        break
+                if obstacle is not None:
+                    break
+        except _BudgetExceeded:
+            self.unknown += 1
+            return None
+        if step is None or obstacle is None:
+            return None
+        self.solved += 1
+        return geo.cells[step], geo.cells[obstacle], winner
+
+    def stats(self):
+        """Sayaçlar (log/benchmark için)."""
+        return {
+            'nodes': self.nodes,
+            'solved': self.solved,
+            'unknown': self.unknown,
+            'entries': len(self._step_bounds) + len(self._attack_bounds),
+        }
@@ -1,3 +1,7 @@
+from abluka.bitboard import (get_geometry, popcount, decode_turn,
+                             OPPONENT_ABLUKA, TURN_SHIFT)
+
+
 class Board:
     """
     Abluka oyununda 7x7 tahtayı yöneten sınıf.
@@ -5,22 +9,297 @@ class Board:
     - 'W' = Beyaz taş
     - 'R' = Engel taşı
     - None = Boş kare
+
+    Tahta bitboard olarak tutulur: engeller, siyah ve beyaz taş birer tam
+    sayıdır (kare indeksi = satir * size + sutun). `grid` ve `obstacles`
+    yalnızca okuma amaçlı görünümlerdir (GUI ve log için).
+
+    İki taşın hamle sayıları (boş komşu sayısı) da move_piece,
+    place_obstacle ve push/pop tarafından sabit zamanda güncellenir.
+
+    Engel olmayan kareler (taşlar dahil) şah komşuluğuyla bölgelere ayrılır.
+    Kareler yalnızca dolduğu için bölgeler sadece bölünür, hiç birleşmez;
+    yeni engeller bekleyen maskesinde biriktirilir ve bölge listesi ilk
+    sorguda artımlı güncellenir (bkz. reachable_area).
     """
 
-    def __init__(self):
-        self.size = 7
-        self.grid = [[None for _ in range(self.size)] for _ in range(self.size)]
-        
+    __slots__ = ('size', 'geo', 'black_bits', 'white_bits', 'obstacle_bits',
+                 'zobrist', '_black_mobility', '_white_mobility', '_regions',
+                 '_pending_obstacles', '_undo', '_grid_cache')
+
+    def __init__(self, size=7):
+        self.size = size
+        self.geo = get_geometry(size)
+
         # Başlangıçta siyah en üst ortada, beyaz en alt ortada
-        self.black_pos = (0, self.size // 2)  
-        self.white_pos = (self.size - 1, self.size // 2)
-        
-        # Tahtada bu konumları işaretle
-        self.grid[self.black_pos[0]][self.black_pos[1]] = 'B'
-        self.grid[self.white_pos[0]][self.white_pos[1]] = 'W'
-        
-        # Engel taşlarının konumlarını da saklayan liste
-        self.obstacles = []
+        self.black_bits = self.geo.bits[self.geo.index((0, size // 2))]
+        self.white_bits = self.geo.bits[self.geo.index((size - 1, size // 2))]
+        self.obstacle_bits = 0
+
+        # Artımlı güncellenen 64 bitlik Zobrist anahtarı (sıra bilgisi hariç)
+        geo = self.geo
+        self.zobrist = (geo.zobrist_black[self.piece_index('B')] ^
+                        geo.zobrist_white[self.piece_index('W')])
+
+        # Canlı hamle sayıları (get_valid_moves listesi üretmeden)
+        free = self.free_bits
+        self._black_mobility = popcount(geo.neighbour_masks[self.piece_index('B')] & free)
+        self._white_mobility = popcount(geo.neighbour_masks[self.piece_index('W')] & free)
+
+        # Engel olmayan karelerin bölgeleri (değişmez tuple, kopyalarla paylaşılır)
+        self._regions = (geo.full_mask,)
+        self._pending_obstacles = 0
+
+        # push/pop için geri alma yığını (ilk push'ta oluşturulur)
+        self._undo = None
+
+        self._grid_cache = None
+
+    def copy(self):
+        """Tahtanın bağımsız bir kopyası (üç tam sayı + anahtar)."""
+        clone = Board.__new__(Board)
+        clone.size = self.size
+        clone.geo = self.geo
+        clone.black_bits = self.black_bits
+        clone.white_bits = self.white_bits
+        clone.obstacle_bits = self.obstacle_bits
+        clone.zobrist = self.zobrist
+        clone._black_mobility = self._black_mobility
+        clone._white_mobility = self._white_mobility
+        clone._regions = self._regions
+        clone._pending_obstacles = self._pending_obstacles
+        clone._undo = None
+        clone._grid_cache = None
+        return clone
+
+    @classmethod
+    def from_rows(cls, rows):
+        """
+        Metin satırlarından tahta ('B', 'W', 'X'/'R' ve '.' karakterleri,
+        boşlukla ayrılmış; log dosyalarındaki "Tahta Durumu" biçimi).
+        Satırlar geçersizse (taş eksik/fazla) None döner.
+        """
+        cells = [line.split() for line in rows]
+        size = len(cells)
+        if size == 0 or any(len(row) != size for row in cells):
+            return None
+        board = cls(size)
+        geo = board.geo
+        black = [geo.index((r, c)) for r in range(size) for c in range(size) if cells[r][c] == 'B']
+        white = [geo.index((r, c)) for r in range(size) for c in range(size) if cells[r][c] == 'W']
+        if len(black) != 1 or len(white) != 1:
+            return None
+        board.black_bits = geo.bits[black[0]]
+        board.white_bits = geo.bits[white[0]]
+        board.zobrist = geo.zobrist_black[black[0]] ^ geo.zobrist_white[white[0]]
+        board._black_mobility = popcount(geo.neighbour_masks[black[0]] & board.free_bits)
+        board._white_mobility = popcount(geo.neighbour_masks[white[0]] & board.free_bits)
+        for r in range(size):
+            for c in range(size):
+                if cells[r][c] in ('X', 'R'):
+                    board.place_obstacle((r, c))
+        return board
+
+    @property
+    def black_pos(self):
+        return self.geo.cells[self.black_bits.bit_length() - 1]
+
+    @property
+    def white_pos(self):
+        return self.geo.cells[self.white_bits.bit_length() - 1]
+
+    @property
+    def obstacles(self):
+        """Engel karelerinin listesi (satır öncelikli sırada)."""
+        cells = self.geo.cells
+        return [cells[i] for i in self.geo.iter_indices(self.obstacle_bits)]
+
+    @property
+    def obstacle_count(self):
+        """Tahtadaki engel sayısı."""
+        return popcount(self.obstacle_bits)
+
+    @property
+    def occupied_bits(self):
+        """Engel veya taş bulunan karelerin maskesi."""
+        return self.obstacle_bits | self.black_bits | self.white_bits
+
+    @property
+    def free_bits(self):
+        """Boş karelerin maskesi."""
+        return self.geo.full_mask & ~(self.obstacle_bits | self.black_bits | self.white_bits)
+
+    @property
+    def black_mobility(self):
+        """Siyahın geçerli hamle sayısı (canlı sayaç)."""
+        return self._black_mobility
+
+    @property
+    def white_mobility(self):
+        """Beyazın geçerli hamle sayısı (canlı sayaç)."""
+        return self._white_mobility
+
+    @property
+    def regions(self):
+        """Engel olmayan karelerin bağlı bölgeleri (bit maskeleri)."""
+        if self._pending_obstacles:
+            self._apply_pending_obstacles()
+        return self._regions
+
+    def region_of(self, piece):
+        """Taşın bulunduğu bölgenin maskesi (diğer taş da içinde olabilir)."""
+        bits = self.black_bits if piece == 'B' else self.white_bits
+        for region in self.regions:
+            if region & bits:
+                return region
+        return 0
+
+    def same_region(self):
+        """Siyah ve beyaz aynı bölgede mi? (Ayrıldılarsa oyun artık alan yarışıdır.)"""
+        return bool(self.region_of('B') & self.white_bits)
+
+    def dead_cells(self):
+        """
+        Hiçbir taşın bir daha ulaşamayacağı boş kareler (taş içermeyen
+        bölgeler). Bu karelere konan engeller birbirinin aynısıdır: oyunu
+        değiştirmez, sadece sırayı geçirir.
+        """
+        pieces = self.black_bits | self.white_bits
+        dead = 0
+        for region in self.regions:
+            if not region & pieces:
+                dead |= region
+        return dead
+
+    def obstacle_targets(self):
+        """
+        Engel adayları maskesi: boş kareler, ölü karelerden yalnızca en
+        küçük indeksli temsilci ("pas" engeli) bırakılarak.
+        """
+        dead = self.dead_cells()
+        return self.free_bits & ~(dead & (dead - 1))
+
+    def reachable_area(self, piece):
+        """
+        Taşın boş kareler üzerinden ulaşabileceği kare sayısı (kendi karesi
+        dahil, rakibin karesi geçilemez). Taşlar ayrı bölgelerdeyse bölge
+        boyutudur; aynı bölgedeyse bölge içinde rakip hariç tutularak yayılır.
+        """
+        if piece == 'B':
+            mine, other = self.black_bits, self.white_bits
+        else:
+            mine, other = self.white_bits, self.black_bits
+        region = self.region_of(piece)
+        if not region & other:
+            return popcount(region)
+        return popcount(self.geo.flood(mine, region & ~other))
+
+    def choke_points(self, piece):
+        """
+        Taşın ulaşabildiği alanın kesme noktaları (bkz. Geometry.articulation_points).
+        Dönüş: (alan, alan maskesi, {kare indeksi: kopan kare sayısı}).
+        Alandaki bir kareye engel konursa alan 1 + kopan kadar küçülür;
+        alan dışındaki engeller alanı değiştirmez.
+        """
+        if piece == 'B':
+            mine, other = self.black_bits, self.white_bits
+        else:
+            mine, other = self.white_bits, self.black_bits
+        region = self.region_of(piece)
+        return self.geo.articulation_points(mine.bit_length() - 1, region & ~other)
+
+    def _apply_pending_obstacles(self):
+        """
+        Bekleyen her engel karesini içeren bölgeden çıkarır, gerekirse
+        bölgeyi parçalara ayırır. Kalan komşular halka tablosuna göre
+        bağlıysa bölünme olmaz (tam yayılım gerekmez).
+        """
+        geo = self.geo
+        regions = self._regions
+        pending = self._pending_obstacles
+        while pending:
+            bit = pending & -pending
+            pending ^= bit
+            i = bit.bit_length() - 1
+            for k, region in enumerate(regions):
+                if region & bit:
+                    break
+            # Engeller tek tek işlenir; henüz işlenmeyenler geçici olarak
+            # bölgede kalır (sonuç, engellerin sırasından bağımsızdır)
+            rest = region ^ bit
+            local = geo.neighbour_masks[i] & rest
+            if geo.ring_connected[i][local]:
+                parts = (rest,) if rest else ()
+            else:
+                parts = []
+                while local:
+                    part = geo.flood(local & -local, rest)
+                    parts.append(part)
+                    rest ^= part
+                    local &= ~part
+                parts = tuple(parts)
+            regions = regions[:k] + parts + regions[k + 1:]
+        self._regions = regions
+        self._pending_obstacles = 0
+
+    def piece_index(self, piece):
+        """Taşın bulunduğu karenin bit indeksi."""
+        bits = self.black_bits if piece == 'B' else self.white_bits
+        return bits.bit_length() - 1
+
+    def key(self, side_to_move):
+        """Sırası gelen oyuncuyu da içeren pozisyon anahtarı."""
+        if side_to_move == 'W':
+            return self.zobrist ^ self.geo.zobrist_side
+        return self.zobrist
+
+    @property
+    def grid(self):
+        """
+        Satır listelerinden oluşan (salt okunur) tahta görünümü.
+        Bitboard değişmedikçe aynı liste döndürülür.
+        """
+        key = (self.obstacle_bits, self.black_bits, self.white_bits)
+        if self._grid_cache is None or self._grid_cache[0] != key:
+            size = self.size
+            grid = [[None] * size for _ in range(size)]
+            for i in self.geo.iter_indices(self.obstacle_bits):
+                grid[i // size][i % size] = 'R'
+            r, c = self.black_pos
+            grid[r][c] = 'B'
+            r, c = self.white_pos
+            grid[r][c] = 'W'
+            self._grid_cache = (key, grid)
+        return self._grid_cache[1]
+
+    def canonical_key(self, side_to_move):
+        """
+        Simetriden bağımsız pozisyon anahtarı.
+        Dönüş: (64 bitlik kanonik Zobrist anahtarı, simetri no). Bir kare
+        indeksi i, kanonik çerçevede geo.sym_perm[simetri][i] olur; geri
+        dönüş için geo.sym_inverse[simetri] kullanılır.
+        """
+        geo = self.geo
+        (obst, b, w), sym = geo.canonical_form(self.obstacle_bits,
+                                               self.piece_index('B'), self.piece_index('W'))
+        key = geo.obstacle_zobrist(obst) ^ geo.zobrist_black[b] ^ geo.zobrist_white[w]
+        if side_to_move == 'W':
+            key ^= geo.zobrist_side
+        return key, sym
+
+    def is_empty(self, pos):
+        """pos tahtada ve boş mu?"""
+        i = self.geo.index(pos)
+        return i >= 0 and not (self.occupied_bits >> i) & 1
+
+    def empty_positions(self, collapse_dead_cells=False):
+        """
+        Tüm boş kareler (satır öncelikli sırada). collapse_dead_cells ile
+        ölü kareler tek temsilciye indirilir (bkz. obstacle_targets).
+        """
+        cells = self.geo.cells
+        mask = self.obstacle_targets() if collapse_dead_cells else self.free_bits
+        return [cells[i] for i in self.geo.iter_indices(mask)]
 
     def is_valid_move(self, piece, start_pos, end_pos):
         """
@@ -29,10 +308,7 @@ class Board:
           2) end_pos boş (None) olmalı,
           3) hareket en fazla 1 adım (yatay/dikey/çapraz) olmalı
         """
-        if not (0 <= end_pos[0] < self.size and 0 <= end_pos[1] < self.size):
-            return False
-        
-        if self.grid[end_pos[0]][end_pos[1]] is not None:
+        if not self.is_empty(end_pos):
             return False
         
         dx = abs(end_pos[0] - start_pos[0])
@@ -46,20 +322,88 @@ class Board:
         """
         Bir taşın (Siyah/Beyaz) mevcut konumundan yapabileceği tüm geçerli hamleleri döndürür.
         """
+        free = self.free_bits
+        cells = self.geo.cells
+        return [cells[j] for j in self.geo.neighbours[self.piece_index(piece)]
+                if (free >> j) & 1]
+
+    def mobility(self, piece):
+        """Taşın geçerli hamle sayısı (canlı sayaçtan)."""
+        return self._black_mobility if piece == 'B' else self._white_mobility
+
+    def _step_mobility(self, piece, start, end):
+        """
+        piece taşı start'tan end'e geçtikten sonra (bitler güncellenmiş
+        olarak) iki sayacı düzeltir: taşın kendisi yeni karede yeniden
+        sayılır, diğer taş boşalan/dolan komşu karelere göre +1/-1 alır.
+        """
+        nmasks = self.geo.neighbour_masks
         if piece == 'B':
-            start_pos = self.black_pos
+            self._black_mobility = popcount(nmasks[end] & self.free_bits)
+            other = nmasks[self.white_bits.bit_length() - 1]
+            self._white_mobility += ((other >> start) & 1) - ((other >> end) & 1)
         else:
-            start_pos = self.white_pos
-        
-        valid_moves = []
-        for dx in [-1, 0, 1]:
-            for dy in [-1, 0, 1]:
-                if dx == 0 and dy == 0:
+            self._white_mobility = popcount(nmasks[end] & self.free_bits)
+            other = nmasks[self.black_bits.bit_length() - 1]
+            self._black_mobility += ((other >> start) & 1) - ((other >> end) & 1)
+
+    def _obstacle_mobility(self, i):
+        """i karesine engel kondu: komşu taşların sayacı bir azalır."""
+        nmasks = self.geo.neighbour_masks
+        self._black_mobility -= (nmasks[self.black_bits.bit_length() - 1] >> i) & 1
+        self._white_mobility -= (nmasks[self.white_bits.bit_length() - 1] >> i) & 1
+
+    def iter_turns(self, piece, exclude_self_abluka=True, flag_opponent_abluka=True,
+                   collapse_dead_cells=False):
+        """
+        piece için tüm geçerli tam turları (adım + engel) kodlanmış tam sayı
+        olarak üretir (bkz. bitboard.encode_turn). Tahta değiştirilmez ve
+        tur başına nesne oluşturulmaz.
+          - exclude_self_abluka : kendini ablukaya sokan turlar atlanır
+          - flag_opponent_abluka: rakibi ablukaya alan turlar OPPONENT_ABLUKA
+                                  bitiyle işaretlenir
+          - collapse_dead_cells : ölü karelere engel turlarından adım başına
+                                  sadece temsilci kare üretilir
+        Sıra: adımlar ve engeller satır öncelikli.
+        """
+        geo = self.geo
+        bits = geo.bits
+        nmasks = geo.neighbour_masks
+        me = self.piece_index(piece)
+        opp = self.piece_index('W' if piece == 'B' else 'B')
+        free = self.free_bits
+        opp_nmask = nmasks[opp]
+        # Adım bölgeleri değiştirmez: ölü kareler tüm adımlar için aynıdır
+        skip = 0
+        if collapse_dead_cells:
+            dead = self.dead_cells()
+            skip = dead & (dead - 1)
+
+        steps = nmasks[me] & free
+        while steps:
+            step_bit = steps & -steps
+            steps ^= step_bit
+            step = step_bit.bit_length() - 1
+            # Adımdan sonra eski kare boşalır, yeni kare dolar
+            free_after = (free | bits[me]) & ~step_bit
+            my_free = nmasks[step] & free_after
+            opp_free = opp_nmask & free_after
+
+            cells = free_after & ~skip
+            while cells:
+                low = cells & -cells
+                cells ^= low
+                if exclude_self_abluka and not (my_free & ~low):
                     continue
-                end_pos = (start_pos[0] + dx, start_pos[1] + dy)
-                if self.is_valid_move(piece, start_pos, end_pos):
-                    valid_moves.append(end_pos)
-        return valid_moves
+                code = step | ((low.bit_length() - 1) << TURN_SHIFT)
+                if flag_opponent_abluka and not (opp_free & ~low):
+                    code |= OPPONENT_ABLUKA
+                yield code
+
+    def turn_positions(self, code):
+        """Kodlanmış tur -> ((satır, sütun) adım, (satır, sütun) engel)."""
+        step, obstacle, _ = decode_turn(code)
+        return self.geo.cells[step], self.geo.cells[obstacle]
 
     def move_piece(self, piece, end_pos):
         """
@@ -75,17 +419,17 @@ class Board:
         if not self.is_valid_move(piece, start_pos, end_pos):
             return False
         
-        # Tahtadan eski konumu temizle
-        self.grid[start_pos[0]][start_pos[1]] = None
-        
-        # Yeni konuma taşı yerleştir
-        self.grid[end_pos[0]][end_pos[1]] = piece
-        
-        # Parça konumunu güncelle
+        # Parça konumunu ve anahtarı güncelle
+        geo = self.geo
+        start = geo.index(start_pos)
+        end = geo.index(end_pos)
         if piece == 'B':
-            self.black_pos = end_pos
+            self.black_bits = geo.bits[end]
+            self.zobrist ^= geo.zobrist_black[start] ^ geo.zobrist_black[end]
         else:
-            self.white_pos = end_pos
+            self.white_bits = geo.bits[end]
+            self.zobrist ^= geo.zobrist_white[start] ^ geo.zobrist_white[end]
+        self._step_mobility(piece, start, end)
         
         return True
 
@@ -94,24 +438,75 @@ class Board:
         pos konumuna 'R' (engel) bırakır.
         Başarılıysa True, aksi halde False.
         """
-        # Tahta sınırı
-        if not (0 <= pos[0] < self.size and 0 <= pos[1] < self.size):
+        # Tahta sınırı ve doluluk kontrolü
+        if not self.is_empty(pos):
             return False
         
-        # orada zaten taş veya engel var mı?
-        if self.grid[pos[0]][pos[1]] is not None:
-            return False
-        
-        self.grid[pos[0]][pos[1]] = 'R'
-        self.obstacles.append(pos)
+        i = self.geo.index(pos)
+        self.obstacle_bits |= self.geo.bits[i]
+        self.zobrist ^= self.geo.zobrist_obstacle[i]
+        self._obstacle_mobility(i)
+        self._pending_obstacles |= self.geo.bits[i]
         return True
 
+    def push(self, piece, move, obstacle):
+        """
+        Arama için yerinde hamle: piece taşını move'a götürür, obstacle'a
+        engel koyar ve geri alma bilgisini yığına ekler. move veya obstacle
+        None olabilir (sadece adım ya da sadece engel).
+        Geçerlilik kontrolü yapılmaz; çağıran taraf geçerli hamle vermelidir.
+        """
+        geo = self.geo
+        old_key = self.zobrist
+        old_mobility = (self._black_mobility, self._white_mobility)
+        old_regions = (self._regions, self._pending_obstacles)
+        if piece == 'B':
+            old_bits = self.black_bits
+            if move is not None:
+                end = move[0] * self.size + move[1]
+                self.black_bits = geo.bits[end]
+                self.zobrist ^= (geo.zobrist_black[old_bits.bit_length() - 1] ^
+                                 geo.zobrist_black[end])
+                self._step_mobility(piece, old_bits.bit_length() - 1, end)
+        else:
+            old_bits = self.white_bits
+            if move is not None:
+                end = move[0] * self.size + move[1]
+                self.white_bits = geo.bits[end]
+                self.zobrist ^= (geo.zobrist_white[old_bits.bit_length() - 1] ^
+                                 geo.zobrist_white[end])
+                self._step_mobility(piece, old_bits.bit_length() - 1, end)
+        if obstacle is not None:
+            i = obstacle[0] * self.size + obstacle[1]
+            self.obstacle_bits |= geo.bits[i]
+            self.zobrist ^= geo.zobrist_obstacle[i]
+            self._obstacle_mobility(i)
+            self._pending_obstacles |= geo.bits[i]
+        if self._undo is None:
+            self._undo = []
+        self._undo.append((piece, old_bits, obstacle, old_key, old_mobility, old_regions))
+
+    def pop(self):
+        """Son push'u geri alır."""
+        (piece, old_bits, obstacle, self.zobrist,
+         old_mobility, old_regions) = self._undo.pop()
+        self._regions, self._pending_obstacles = old_regions
+        self._black_mobility, self._white_mobility = old_mobility
+        if piece == 'B':
+            self.black_bits = old_bits
+        else:
+            self.white_bits = old_bits
+        if obstacle is not None:
+            self.obstacle_bits &= ~self.geo.bits[obstacle[0] * self.size + obstacle[1]]
+
     def is_abluka(self, piece):
         """
         İlgili taşın hiç hamlesi yoksa abluka (kilitlenme) var demektir.
         True/False döndürür.
         """
-        return (len(self.get_valid_moves(piece)) == 0)
+        if piece == 'B':
+            return self._black_mobility == 0
+        return self._white_mobility == 0
 
     def __str__(self):
         """
@@ -143,6 +538,9 @@ class Game:
       - turn_count
       - make_move vb.
     """
+
+    __slots__ = ('board', 'current_player', 'game_over', 'winner', 'turn_count')
+
     def __init__(self):
         self.board = Board()
         self.current_player = 'B'  # varsayılan: Siyah başlasın
@@ -150,6 +548,11 @@ class Game:
         self.winner = None
         self.turn_count = 0
 
+    @property
+    def zobrist_key(self):
+        """Tahta + sıradaki oyuncu için 64 bitlik Zobrist anahtarı."""
+        return self.board.key(self.current_player)
+
     def switch_player(self):
         """Sıradaki oyuncuyu değiştir."""
         self.current_player = 'W' if self.current_player == 'B' else 'B'
@@ -164,20 +567,17 @@ class Game:
         Eğer hamle rakibi ablukada bırakırsa game_over ve winner güncellenir.
         Eğer hamleden sonra (player switch) yeni oyuncu ablukadaysa, yine game_over.
         """
+        start_pos = self.board.black_pos if self.current_player == 'B' else self.board.white_pos
+
         # 1) Taşı ilerlet
         if not self.board.move_piece(self.current_player, move_pos):
             return False
-        
+
         # 2) Engel koy
         if not self.board.place_obstacle(obstacle_pos):
             # Engel koyma başarısızsa => rollback
-            # Basit rollback: taşı geri al
-            if self.current_player == 'B':
-                self.board.grid[move_pos[0]][move_pos[1]] = None
-                self.board.grid[self.board.black_pos[0]][self.board.black_pos[1]] = 'B'
-            else:
-                self.board.grid[move_pos[0]][move_pos[1]] = None
-                self.board.grid[self.board.white_pos[0]][self.board.white_pos[1]] = 'W'
+            # Basit rollback: taşı eski (artık boş olan) karesine geri al
+            self.board.move_piece(self.current_player, start_pos)
             return False
         
         self.turn_count += 1
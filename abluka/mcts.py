@@ -0,0 +1,194 @@
+"""
+Monte Carlo ağaç araması (UCT).
+
+Her iterasyon:
+    1) seçim   : UCT değeri en yüksek çocuğa inilir
+                 (kazanç oranı + c * sqrt(ln N / n))
+    2) genişleme: denenmemiş bir tur ağaca eklenir
+    3) oynatma : oyun rastgele turlarla abluka olana kadar oynanır
+                 (ham bitboard çekirdeği, bkz. abluka.playout)
+    4) geri yayılım: sonuç yol boyunca her düğümün hamle yapanına göre işlenir
+
+Rakibi hemen ablukaya alan bir tur varsa (kendini de kapatsa) düğümün tek
+çocuğu odur; kendini ablukaya sokan diğer turlar hiç açılmaz, ölü karelere
+engeller tek çocukta toplanır (bkz. Board.iter_turns).
+"""
+
+import math
+import random
+import time
+
+from abluka.bitboard import decode_turn, OPPONENT_ABLUKA
+from abluka.playout import board_playout, PLAYOUT_BIAS
+
+
+EXPLORATION = 1.4   # UCT keşif katsayısı (c)
+
+
+class _Node:
+    """Ağaç düğümü: buraya gelen tur ve o turu oynayan taraf."""
+
+    __slots__ = ('code', 'mover', 'parent', 'children', 'untried',
+                 'visits', 'wins', 'terminal')
+
+    def __init__(self, code, mover, parent):
+        self.code = code
+        self.mover = mover
+        self.parent = parent
+        self.children = []
+        self.untried = None     # ilk ziyarette üretilir
+        self.visits = 0
+        self.wins = 0.0
+        self.terminal = None    # kesin kazanan ('B'/'W') ya da None
+
+
+class MCTS:
+    """
+    UCT araması. search(board, side, time_limit, max_iterations) en çok
+    ziyaret edilen kök turunu (adım, engel) döndürür; sayaçlar stats()'ta.
+    """
+
+    def __init__(self, exploration=EXPLORATION, seed=None, playout_bias=PLAYOUT_BIAS):
+        self.exploration = exploration
+        self.playout_bias = playout_bias
+        self.rng = random.Random(seed)
+        self.last_stats = {}
+
+    def _expand_turns(self, board, side):
+        """
+        Düğümün turları; hemen kazandıran tur (kendini de kapatsa, rakibin
+        ablukası önce bakıldığı için kazandırır) varsa sadece o. Engeller
+        rakibin iki adım çevresi ve kendi yeni karemizin komşuluğuyla
+        sınırlanır (uzak engeller ağaçta dal sayısını boşuna büyütür);
+        rakibe bitişik engeller önce denenir.
+        """
+        geo = board.geo
+        opp = board.piece_index('W' if side == 'B' else 'B')
+        opp_near = geo.neighbour_masks[opp]
+        opp_zone = geo.dilate(opp_near)
+        bits = geo.bits
+        nmasks = geo.neighbour_masks
+        free = board.free_bits | bits[board.piece_index(side)]
+        turns = []
+        for code in board.iter_turns(side, exclude_self_abluka=False, collapse_dead_cells=True):
+            if code & OPPONENT_ABLUKA:
+                return [code]
+            step, obstacle, _ = decode_turn(code)
+            # Kendini ablukaya sokan (rakibi kapatmayan) tur açılmaz
+            if nmasks[step] & free & ~bits[step] & ~bits[obstacle]:
+                turns.append(code)
+        near, far = [], []
+        for code in turns:
+            step, obstacle, _ = decode_turn(code)
+            bit = bits[obstacle]
+            if bit & opp_near:
+                near.append(code)
+            elif bit & (opp_zone | nmasks[step]):
+                far.append(code)
+        if not near and not far:
+            # Bölge dışında da olsa en az bir tur kalmalı
+            far = turns
+        self.rng.shuffle(near)
+        self.rng.shuffle(far)
+        # untried sondan tüketilir: yakın engeller sona
+        return far + near
+
+    def search(self, board, side, time_limit, max_iterations=None):
+        """Kök için en çok ziyaret edilen (adım, engel); tur yoksa None."""
+        start = time.time()
+        work = board.copy()
+        cells = work.geo.cells
+        rng_log = math.log
+        c = self.exploration
+        root_mover = 'W' if side == 'B' else 'B'
+        root = _Node(None, root_mover, None)
+        iterations = 0
+        max_depth = 0
+        tree_nodes = 1
+        playout_turns = 0
+
+        while True:
+            if max_iterations is not None and iterations >= max_iterations:
+                break
+            # Saat her iterasyonda değil, 32'de bir okunur
+            if iterations & 31 == 0 and time.time() - start >= time_limit:
+                break
+            iterations += 1
+            node = root
+            to_move = side
+            depth = 0
+
+            # 1) Seçim
+            while node.terminal is None and node.untried is not None \
+                    and not node.untried and node.children:
+                log_n = rng_log(node.visits)
+                best = None
+                best_value = -1.0
+                for child in node.children:
+                    value = child.wins / child.visits + c * math.sqrt(log_n / child.visits)
+                    if value > best_value:
+                        best_value = value
+                        best = child
+                node = best
+                step, obstacle, _ = decode_turn(node.code)
+                work.push(to_move, cells[step], cells[obstacle])
+                to_move = 'W' if to_move == 'B' else 'B'
+                depth += 1
+
+            # 2) Genişleme
+            if node.terminal is None:
+                if node.untried is None:
+                    node.untried = self._expand_turns(work, to_move)
+                    if not node.untried:
+                        # Kendini kapatmayan tur yok: sıradaki kaybeder
+                        node.terminal = node.mover
+                if node.untried:
+                    code = node.untried.pop()
+                    child = _Node(code, to_move, node)
+                    if code & OPPONENT_ABLUKA:
+                        child.terminal = to_move
+                    node.children.append(child)
+                    tree_nodes += 1
+                    node = child
+                    step, obstacle, _ = decode_turn(code)
+                    work.push(to_move, cells[step], cells[obstacle])
+                    to_move = 'W' if to_move == 'B' else 'B'
+                    depth += 1
+
+            # 3) Oynatma
+            if node.terminal is not None:
+                winner = node.terminal
+            else:
+                winner, length = board_playout(work, to_move, self.rng, self.playout_bias)
+                playout_turns += length
+            for _ in range(depth):
+                work.pop()
+            if depth > max_depth:
+                max_depth = depth
+
+            # 4) Geri yayılım
+            while node is not None:
+                node.visits += 1
+                if node.mover == winner:
+                    node.wins += 1.0
+                node = node.parent
+
+        elapsed = max(time.time() - start, 1e-9)
+        self.last_stats = {
+            'iterations': iterations,
+            'iterations_per_sec': iterations / elapsed,
+            'tree_nodes': tree_nodes,
+            'max_depth': max_depth,
+            'avg_playout_turns': playout_turns / iterations if iterations else 0.0,
+        }
+        if not root.children:
+            return None
+        best = max(root.children, key=lambda n: n.visits)
+        self.last_stats['best_visits'] = best.visits
+        self.last_stats['best_win_rate'] = best.wins / best.visits
+        step, obstacle, _ = decode_turn(best.code)
+        return cells[step], cells[obstacle]
+
+    def stats(self):
+        """Son aramanın sayaçları (log/benchmark için)."""
+        return dict(self.last_stats)
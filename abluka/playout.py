@@ -0,0 +1,73 @@
+"""
+Ham bitboard üzerinde rastgele oyun (playout) çekirdeği.
+
+Board nesnesi, liste ya da geri alma yığını kullanılmaz: durum yalnızca
+engel maskesi ve iki taşın kare indeksidir. Rollout tabanlı aramalar (MCTS)
+ve self-play veri üretimi için "abluka olana kadar rastgele oyna" temel
+işlemi.
+
+Politika (MCTS ile aynı):
+  - rastgele bir adım seçilir,
+  - adımdan sonra rakibin en fazla bir boş komşusu kalıyorsa kapatılır
+    (kazanç),
+  - aksi halde bias olasılıkla rakibin boş komşularından, yoksa tüm boş
+    karelerden rastgele bir engel seçilir; kendi son boş komşusuna engel
+    konmaz.
+"""
+
+from abluka.bitboard import popcount
+
+
+PLAYOUT_BIAS = 0.5  # engelin rakibin yanına konma olasılığı
+
+
+def random_playout(geo, obstacles, black, white, black_to_move, rng, bias=PLAYOUT_BIAS):
+    """
+    obstacles: engel maskesi, black/white: taşların kare indeksleri,
+    black_to_move: sıra siyahta mı, rng: random.Random (tohumlu).
+    Dönüş: (kazanan 'B'/'W', oynanan tur sayısı).
+    """
+    nmasks = geo.neighbour_masks
+    bits = geo.bits
+    full = geo.full_mask
+    rand = rng.random
+    if black_to_move:
+        me, opp = black, white
+    else:
+        me, opp = white, black
+    length = 0
+    while True:
+        free = full & ~(obstacles | bits[me] | bits[opp])
+        steps = nmasks[me] & free
+        if not steps:
+            return ('W' if black_to_move else 'B'), length
+        # Rastgele adım: k. küme bit
+        for _ in range(int(rand() * popcount(steps))):
+            steps &= steps - 1
+        step_bit = steps & -steps
+        free_after = (free | bits[me]) & ~step_bit
+        opp_free = nmasks[opp] & free_after
+        if not opp_free & (opp_free - 1):
+            # Rakibin en fazla bir boş komşusu kaldı: kapatılır
+            return ('B' if black_to_move else 'W'), length + 1
+        step = step_bit.bit_length() - 1
+        candidates = opp_free if rand() < bias else free_after
+        my_free = nmasks[step] & free_after
+        if not my_free & (my_free - 1):
+            candidates &= ~my_free
+        if not candidates:
+            # Her engel kendini kapatıyor: sıradaki tur kaybeder
+            return ('W' if black_to_move else 'B'), length
+        for _ in range(int(rand() * popcount(candidates))):
+            candidates &= candidates - 1
+        obstacles |= candidates & -candidates
+        me, opp = opp, step
+        black_to_move = not black_to_move
+        length += 1
+
+
+def board_playout(board, side, rng, bias=PLAYOUT_BIAS):
+    """Board pozisyonundan (değiştirmeden) random_playout."""
+    return random_playout(board.geo, board.obstacle_bits, board.piece_index('B'),
+                          board.piece_index('W'), side == 'B', rng, bias)
+
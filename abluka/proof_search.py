@@ -0,0 +1,348 @@
+"""
+Proof-number (df-pn) çözücü ve kalıcı çözülmüş pozisyon deposu.
+
+Her düğümde sıradaki oyuncu için iki sayı tutulur:
+    phi  : "sıradaki kazanır" kanıtı için en az açılması gereken yaprak
+    delta: "sıradaki kaybeder" kanıtı için en az açılması gereken yaprak
+Düğümün phi'si çocukların delta'larının en küçüğü, delta'sı çocukların
+phi'lerinin toplamıdır. Derinlik öncelikli sürüm (df-pn) en umut verici
+çocuğa eşiklerle iner; değerler Zobrist anahtarlı tabloda saklanır.
+Abluka'da engeller hiç kalkmadığından pozisyon tekrarı (döngü) olmaz.
+
+Taşlar ayrılmış pozisyonlar EndgameSolver ile doğrudan çözülür.
+
+Kanıtlanan kök pozisyonlar simetriden bağımsız anahtarla (Board.canonical_key)
+SolvedStore'a yazılır; AIPlayer.choose_move önce bu depoya bakar.
+
+Toplu çözüm (log dosyalarındaki pozisyonlardan):
+    python -m abluka.proof_search logs/*.log --nodes 200000
+"""
+
+import argparse
+import glob
+import os
+import pickle
+import time
+
+from abluka.bitboard import decode_turn, OPPONENT_ABLUKA
+from abluka.endgame import EndgameSolver
+from abluka.game_logic import Board
+
+
+INF = 10 ** 9
+NODE_BUDGET = 50000      # tek çözüm çağrısı için düğüm sınırı
+STORE_FILE = "abluka_solved.pkl"
+
+
+class _BudgetExceeded(Exception):
+    pass
+
+
+class SolvedStore:
+    """
+    Kanıtlanmış pozisyonlar: kanonik anahtar -> (sıradaki kazanır mı,
+    adım, engel). Kare indeksleri kanonik çerçevede saklanır; sorguda
+    tahtanın kendi çerçevesine çevrilir (geo.sym_inverse).
+    """
+
+    def __init__(self, path=STORE_FILE):
+        self.path = path
+        self.entries = {}
+        self.hits = 0
+        self.dirty = False
+        self.load()
+
+    def load(self):
+        if not self.path or not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, 'rb') as f:
+                self.entries = pickle.load(f)
+            print(f"[PNS] Çözülmüş pozisyon deposu yüklendi: {len(self.entries)} kayıt")
+        except Exception as e:
+            self.entries = {}
+            print("[PNS] Depo yüklenemedi:", e)
+
+    def save(self):
+        """Değişiklik varsa dosyaya yazar."""
+        if not self.dirty or not self.path:
+            return
+        try:
+            with open(self.path, 'wb') as f:
+                pickle.dump(self.entries, f)
+            self.dirty = False
+            print(f"[PNS] Depo kaydedildi: {len(self.entries)} kayıt")
+        except Exception as e:
+            print("[PNS] Kayıt hatası:", e)
+
+    def lookup(self, board, side):
+        """Kayıt varsa (kazanır mı, adım, engel), yoksa None."""
+        key, sym = board.canonical_key(side)
+        entry = self.entries.get(key)
+        if entry is None:
+            return None
+        self.hits += 1
+        wins, step, obstacle = entry
+        if not wins:
+            return False, None, None
+        geo = board.geo
+        inverse = geo.sym_inverse[sym]
+        return True, geo.cells[inverse[step]], geo.cells[inverse[obstacle]]
+
+    def record(self, board, side, wins, step=None, obstacle=None):
+        """Kanıtlanan sonucu ekler (adım/engel (satır, sütun) olarak)."""
+        key, sym = board.canonical_key(side)
+        if wins:
+            geo = board.geo
+            perm = geo.sym_perm[sym]
+            entry = (True, perm[geo.index(step)], perm[geo.index(obstacle)])
+        else:
+            entry = (False, None, None)
+        if self.entries.get(key) != entry:
+            self.entries[key] = entry
+            self.dirty = True
+
+    def __len__(self):
+        return len(self.entries)
+
+
+class ProofNumberSearch:
+    """
+    df-pn çözücü. solve(board, side) sıradaki oyuncunun kesin sonucunu
+    ve kazanıyorsa kazandıran (adım, engel) hamlesini bulur; bütçe
+    aşılırsa None döner. Tablo çağrılar arasında korunur.
+    """
+
+    def __init__(self, node_budget=NODE_BUDGET, max_entries=1000000, endgame=None,
+                 endgame_budget=2000):
+        self.node_budget = node_budget
+        self.max_entries = max_entries
+        self.endgame = endgame if endgame is not None else EndgameSolver()
+        self.endgame_budget = endgame_budget
+        self._table = {}   # anahtar -> (phi, delta)
+        self.nodes = 0
+        self.proven = 0
+        self.disproven = 0
+        self.unknown = 0
+
+    def _tick(self):
+        self.nodes += 1
+        if self.nodes > self._budget_end:
+            raise _BudgetExceeded()
+
+    def _children(self, board, side):
+        """
+        Çocuk turları ve anahtarları. Sıradaki hemen kazanıyorsa
+        ya da hiç turu yoksa (kendini ablukaya sokmayan) kesin sonuç döner:
+        (kesin (phi, delta) ya da None, [(tur kodu, çocuk anahtarı), ...]).
+        """
+        geo = board.geo
+        other = 'W' if side == 'B' else 'B'
+        me = board.piece_index(side)
+        piece_z = geo.zobrist_black if side == 'B' else geo.zobrist_white
+        base = board.zobrist ^ piece_z[me]
+        if other == 'W':
+            base ^= geo.zobrist_side
+        obstacle_z = geo.zobrist_obstacle
+        bits = geo.bits
+        nmasks = geo.neighbour_masks
+        free = board.free_bits | bits[me]
+        children = []
+        # Rakibi ablukaya alan tur, kendini de kapatsa kazandırır; ölü
+        # karelere engeller birbirinin aynısı olduğundan tek temsilci açılır
+        for code in board.iter_turns(side, exclude_self_abluka=False, collapse_dead_cells=True):
+            if code & OPPONENT_ABLUKA:
+                return (0, INF), None
+            step, obstacle, _ = decode_turn(code)
+            if not nmasks[step] & free & ~bits[step] & ~bits[obstacle]:
+                continue
+            children.append((code, base ^ piece_z[step] ^ obstacle_z[obstacle]))
+        if not children:
+            return (INF, 0), None
+        return None, children
+
+    def _mid(self, board, side, phi_th, delta_th):
+        """Düğümü eşiklerden biri aşılana ya da sonuç kesinleşene kadar açar."""
+        self._tick()
+        key = board.key(side)
+        table = self._table
+        other = 'W' if side == 'B' else 'B'
+
+        known, children = self._children(board, side)
+        if known is None and self.endgame is not None:
+            winner = self.endgame.solve(board, side, self.endgame_budget)
+            if winner is not None:
+                known = (0, INF) if winner == side else (INF, 0)
+        if known is not None:
+            table[key] = known
+            return
+
+        cells = board.geo.cells
+        while True:
+            phi = INF
+            delta = 0
+            best = None
+            best_phi = 1
+            second = INF
+            for code, child_key in children:
+                c_phi, c_delta = table.get(child_key, (1, 1))
+                delta += c_phi
+                if c_delta < phi:
+                    second = phi
+                    phi = c_delta
+                    best = code
+                    best_phi = c_phi
+                elif c_delta < second:
+                    second = c_delta
+            if delta > INF:
+                delta = INF
+            if phi >= phi_th or delta >= delta_th:
+                table[key] = (phi, delta)
+                return
+            step, obstacle, _ = decode_turn(best)
+            board.push(side, cells[step], cells[obstacle])
+            self._mid(board, other,
+                      delta_th - delta + best_phi,
+                      min(phi_th, second + 1))
+            board.pop()
+
+    def _winning_turn(self, board, side):
+        """Kanıtlanmış kökte kazandıran tur (tablodan)."""
+        _, children = self._children(board, side)
+        cells = board.geo.cells
+        if children is None:
+            for code in board.iter_turns(side, exclude_self_abluka=False):
+                if code & OPPONENT_ABLUKA:
+                    step, obstacle, _ = decode_turn(code)
+                    return cells[step], cells[obstacle]
+            return None
+        for code, child_key in children:
+            if self._table.get(child_key, (1, 1))[1] == 0:
+                step, obstacle, _ = decode_turn(code)
+                return cells[step], cells[obstacle]
+        return None
+
+    def solve(self, board, side, node_budget=None):
+        """
+        Dönüş: (sıradaki kazanır mı, adım, engel) ya da None (bütçe aşıldı).
+        Kayıpta adım/engel None'dır.
+        """
+        if len(self._table) > self.max_entries:
+            self._table.clear()
+        # Ayrık bölgelerde oyun sonu çözücüsü hamleyi doğrudan verir
+        if self.endgame is not None:
+            proven = self.endgame.best_turn(board, side)
+            if proven:
+                step, obstacle, winner = proven
+                if winner == side:
+                    self.proven += 1
+                    return True, step, obstacle
+                self.disproven += 1
+                return False, None, None
+        work = board.copy()
+        self._budget_end = self.nodes + (node_budget or self.node_budget)
+        try:
+            self._mid(work, side, INF, INF)
+        except _BudgetExceeded:
+            self.unknown += 1
+            return None
+        phi, delta = self._table[work.key(side)]
+        if phi == 0:
+            turn = self._winning_turn(work, side)
+            if turn is None:
+                self.unknown += 1
+                return None
+            self.proven += 1
+            return True, turn[0], turn[1]
+        self.disproven += 1
+        return False, None, None
+
+    def stats(self):
+        """Sayaçlar (log/benchmark için)."""
+        return {
+            'nodes': self.nodes,
+            'proven': self.proven,
+            'disproven': self.disproven,
+            'unknown': self.unknown,
+            'entries': len(self._table),
+        }
+
+
+def harvest_log_positions(path):
+    """
+    Oyun logundaki her "Tahta Durumu" için (Board, sıradaki oyuncu).
+    AI hamlelerinde tahta hamleden önceki, insan hamlelerinde (gui.py)
+    hamleden sonraki tahtadır; ikisinde de sıradaki AI'dır. AI rengi
+    "Oyuncu: AI (B)" satırından okunur.
+    """
+    positions = []
+    with open(path, encoding='utf-8') as f:
+        lines = [line.rstrip('\n') for line in f]
+    ai_color = None
+    for line in lines:
+        if line.startswith('Oyuncu: AI ('):
+            ai_color = line[len('Oyuncu: AI (')]
+            break
+    if ai_color not in ('B', 'W'):
+        return positions
+    side = None
+    k = 0
+    while k < len(lines):
+        line = lines[k]
+        if line.startswith('Oyuncu: '):
+            side = ai_color
+        elif line.startswith('Tahta Durumu:') and side is not None:
+            rows = []
+            k += 1
+            while k < len(lines) and lines[k].strip() and not lines[k].startswith('---'):
+                rows.append(lines[k])
+                k += 1
+            board = Board.from_rows(rows)
+            if board is not None:
+                positions.append((board, side))
+            side = None
+            continue
+        k += 1
+    return positions
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Abluka log pozisyonlarını df-pn ile çöz')
+    parser.add_argument('logs', nargs='*', help='Log dosyaları (varsayılan: logs/*.log)')
+    parser.add_argument('--store', default=STORE_FILE, help='Çözülmüş pozisyon deposu')
+    parser.add_argument('--nodes', type=int, default=200000, help='Pozisyon başına düğüm sınırı')
+    parser.add_argument('--min-obstacles', type=int, default=0,
+                        help='Daha az engelli (açılış) pozisyonları atla')
+    args = parser.parse_args()
+
+    paths = args.logs or sorted(glob.glob(os.path.join('logs', '*.log')))
+    store = SolvedStore(args.store)
+    solver = ProofNumberSearch(node_budget=args.nodes)
+    seen = set()
+    counts = {'win': 0, 'loss': 0, 'unknown': 0, 'known': 0}
+    start = time.time()
+    for path in paths:
+        for board, side in harvest_log_positions(path):
+            if board.obstacle_count < args.min_obstacles:
+                continue
+            key = board.canonical_key(side)[0]
+            if key in seen:
+                continue
+            seen.add(key)
+            if store.lookup(board, side) is not None:
+                counts['known'] += 1
+                continue
+            result = solver.solve(board, side)
+            if result is None:
+                counts['unknown'] += 1
+                continue
+            wins, step, obstacle = result
+            store.record(board, side, wins, step, obstacle)
+            counts['win' if wins else 'loss'] += 1
+        print(f"[PNS] {path}: {counts}")
+    store.save()
+    print(f"[PNS] {len(seen)} pozisyon, {time.time() - start:.1f} sn, {solver.stats()}")
+
+
+if __name__ == "__main__":
+    main()
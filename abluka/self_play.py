@@ -11,7 +11,7 @@ from matplotlib.backends.backend_agg import FigureCanvasAgg
 from matplotlib.figure import Figure
 import numpy as np
 
-from abluka.game_logic import Game, Board
+from abluka.game_logic import Game
 from abluka.ai_player import AIPlayer
 
 class AblukaSelfPlay:
@@ -447,19 +447,9 @@ class AblukaSelfPlay:
             if not val_moves:
                 break
             mv = random.choice(val_moves)
-            tmp_board = Board()
-            tmp_board.size = game.board.size
-            tmp_board.grid = [row[:] for row in game.board.grid]
-            tmp_board.black_pos = game.board.black_pos
-            tmp_board.white_pos = game.board.white_pos
-            tmp_board.obstacles = game.board.obstacles.copy()
-            
+            tmp_board = game.board.copy()
             tmp_board.move_piece(cp, mv)
-            empties = []
-            for r in range(tmp_board.size):
-                for c in range(tmp_board.size):
-                    if tmp_board.grid[r][c] is None:
-                        empties.append((r,c))
+            empties = tmp_board.empty_positions()
             if empties:
                 obs = random.choice(empties)
                 game.make_move(mv,obs)
@@ -0,0 +1,158 @@
+"""
+Zorunlu abluka (threat-space) araması.
+
+Saldıran taraf yalnızca zorlayıcı hamleleri dener: adımın ardından engeli
+sadece savunanın boş komşularına koyar. Savunanın ise bütün adımları
+denenir; engelleri ufuk içindeki karelerle (her iki taşa en fazla
+kalan tur + 1 şah adımı) sınırlanır, ufuk dışındaki kareler birbirine
+denk olduğundan tek temsilci yeterlidir. Böylece bulunan her kazanç
+kesindir; bulunamaması ise kazanç olmadığı anlamına gelmez.
+"""
+
+from abluka.bitboard import popcount
+
+
+NODE_BUDGET = 20000   # tek arama çağrısı için düğüm sınırı
+
+
+class _BudgetExceeded(Exception):
+    pass
+
+
+class ThreatSearch:
+    """
+    forced_win(board, attacker, max_turns): attacker sıradayken en fazla
+    max_turns turda rakibi ablukaya almayı garanti eden ilk (adım, engel).
+    Tamamlanan alt aramalar (pozisyon, kalan tur) anahtarıyla saklanır.
+    """
+
+    def __init__(self, node_budget=NODE_BUDGET, max_entries=200000):
+        self.node_budget = node_budget
+        self.max_entries = max_entries
+        self._memo = {}
+        self.nodes = 0
+        self.found = 0
+
+    def _tick(self):
+        self.nodes += 1
+        if self.nodes > self._budget_end:
+            raise _BudgetExceeded()
+
+    def _attack(self, board, att, dfn, turns):
+        """att sırada: turns turda zorunlu abluka varsa (adım, engel), yoksa None."""
+        key = (board.key(att), turns)
+        if key in self._memo:
+            return self._memo[key]
+        self._tick()
+        geo = board.geo
+        cells = geo.cells
+        nmasks = geo.neighbour_masks
+        def_i = board.piece_index(dfn)
+        def_dist = geo.distance[def_i]
+        found = None
+        # Savunana yakın adımlar önce
+        steps = sorted(geo.iter_indices(nmasks[board.piece_index(att)] & board.free_bits),
+                       key=lambda j: def_dist[j])
+        for step in steps:
+            board.push(att, cells[step], None)
+            free = board.free_bits
+            targets = nmasks[def_i] & free
+            # Son turda tek engel en fazla bir kareyi kapatabilir
+            if turns == 1 and popcount(targets) > 1:
+                board.pop()
+                continue
+            if not targets:
+                # Adımın kendisi ablukaya aldı: engel herhangi bir boş kareye
+                targets = free & -free
+            for obs in geo.iter_indices(targets):
+                board.push(att, None, cells[obs])
+                if board.is_abluka(dfn):
+                    found = (cells[step], cells[obs])
+                elif (turns > 1 and not board.is_abluka(att)
+                        and self._defend(board, att, dfn, turns - 1)):
+                    found = (cells[step], cells[obs])
+                board.pop()
+                if found:
+                    break
+            board.pop()
+            if found:
+                break
+        if len(self._memo) >= self.max_entries:
+            self._memo.clear()
+        self._memo[key] = found
+        return found
+
+    def _defend(self, board, att, dfn, turns):
+        """dfn sırada: her cevaba karşı att turns turda ablukaya alabiliyor mu?"""
+        self._tick()
+        geo = board.geo
+        cells = geo.cells
+        nmasks = geo.neighbour_masks
+        att_bits = board.black_bits if att == 'B' else board.white_bits
+        def_i = board.piece_index(dfn)
+        free = board.free_bits
+        # Adımdan sonra boşalan eski kare de serbest komşu sayılır
+        free_after = free | geo.bits[def_i]
+        steps = sorted(geo.iter_indices(nmasks[def_i] & free),
+                       key=lambda j: -popcount(nmasks[j] & free_after & ~geo.bits[j]))
+
+        if turns == 1:
+            # Son tur: 3+ serbest komşulu bir kareye kaçıp engeli uzağa
+            # koyabiliyorsa saldıran tek turda kapatamaz
+            for s in steps:
+                around = nmasks[s] & free_after & ~geo.bits[s]
+                if popcount(around) >= 3 and free & ~around & ~geo.bits[s]:
+                    return False
+
+        # Ufuk: kalan turlarda taşların görebileceği kareler
+        zone = att_bits | geo.bits[def_i]
+        for _ in range(turns + 1):
+            zone = geo.dilate(zone)
+        near_att = geo.dilate(att_bits)
+
+        for s in steps:
+            board.push(dfn, cells[s], None)
+            free = board.free_bits
+            outside = free & ~zone
+            candidates = [free & zone & near_att, free & zone & ~near_att]
+            if outside:
+                candidates.append(outside & -outside)
+            for mask in candidates:
+                for obs in geo.iter_indices(mask):
+                    board.push(dfn, None, cells[obs])
+                    if board.is_abluka(att):
+                        board.pop()
+                        board.pop()
+                        return False
+                    # Kendini ablukaya sokan cevap kaybeder
+                    if not board.is_abluka(dfn) and not self._attack(board, att, dfn, turns):
+                        board.pop()
+                        board.pop()
+                        return False
+                    board.pop()
+            board.pop()
+        return True
+
+    def forced_win(self, board, attacker, max_turns=3, node_budget=None):
+        """
+        Turları 1'den max_turns'e artırarak zorunlu abluka arar.
+        Dönüş: (adım, engel, tur sayısı) ya da None (yok/bütçe bitti).
+        """
+        if board.is_abluka(attacker):
+            return None
+        defender = 'W' if attacker == 'B' else 'B'
+        work = board.copy()
+        self._budget_end = self.nodes + (node_budget or self.node_budget)
+        try:
+            for turns in range(1, max_turns + 1):
+                found = self._attack(work, attacker, defender, turns)
+                if found:
+                    self.found += 1
+                    return found[0], found[1], turns
+        except _BudgetExceeded:
+            pass
+        return None
+
+    def stats(self):
+        """Sayaçlar (log/benchmark için)."""
+        return {'nodes': self.nodes, 'found': self.found, 'entries': len(self._memo)}
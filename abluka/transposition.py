@@ -0,0 +1,67 @@
+"""
+Alpha-beta araması için sınırlı boyutlu transpozisyon tablosu.
+
+Anahtar olarak Board.key(side) (Zobrist) kullanılır. Her kayıt:
+    (derinlik, sınır tipi, skor, en iyi (hamle, engel))
+"""
+
+# Sınır tipleri
+EXACT = 0   # skor kesin değer
+LOWER = 1   # gerçek değer >= skor (beta kesmesi)
+UPPER = 2   # gerçek değer <= skor (alpha'yı geçemedi)
+
+
+class TranspositionTable:
+    """
+    Derinlik öncelikli transpozisyon tablosu.
+
+    Değiştirme politikası:
+      - Aynı anahtar için daha sığ bir sonuç, daha derin kaydın üzerine yazılmaz
+        (en iyi hamle yine de güncellenir).
+      - Tablo dolduğunda en eski eklenen kayıt atılır.
+    """
+
+    def __init__(self, max_entries=200000):
+        self.max_entries = max_entries
+        self.entries = {}
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.evictions = 0
+
+    def probe(self, key):
+        """Kayıt varsa (derinlik, tip, skor, en_iyi), yoksa None."""
+        entry = self.entries.get(key)
+        if entry is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return entry
+
+    def store(self, key, depth, flag, score, best):
+        old = self.entries.get(key)
+        if old is not None:
+            if old[0] > depth:
+                if best is not None and best != old[3]:
+                    self.entries[key] = (old[0], old[1], old[2], best)
+                return
+        elif len(self.entries) >= self.max_entries:
+            del self.entries[next(iter(self.entries))]
+            self.evictions += 1
+        self.entries[key] = (depth, flag, score, best)
+        self.stores += 1
+
+    def clear(self):
+        self.entries.clear()
+
+    def stats(self):
+        """Sayaçlar (GUI/log/benchmark için)."""
+        total = self.hits + self.misses
+        return {
+            'size': len(self.entries),
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': (self.hits / total) if total else 0.0,
+            'stores': self.stores,
+            'evictions': self.evictions,
+        }
@@ -0,0 +1,91 @@
+"""
+Board bölge takibi (regions / region_of / same_region / reachable_area)
+doğruluk testi: tohumlu rastgele oyunlarda push/pop/copy sonrası sonuçlar
+küme tabanlı düz bir DFS ile karşılaştırılır.
+"""
+
+import random
+
+import pytest
+
+from abluka.game_logic import Board
+
+
+def _flood(board, start, blocked=()):
+    """Referans: start'tan engel olmayan karelerde DFS (blocked geçilemez)."""
+    size = board.size
+    seen = {start}
+    stack = [start]
+    while stack:
+        r, c = stack.pop()
+        for dr in (-1, 0, 1):
+            for dc in (-1, 0, 1):
+                nxt = (r + dr, c + dc)
+                if nxt in seen or nxt in blocked:
+                    continue
+                if not (0 <= nxt[0] < size and 0 <= nxt[1] < size):
+                    continue
+                if not board.is_empty(nxt) and nxt not in (board.black_pos, board.white_pos):
+                    continue
+                seen.add(nxt)
+                stack.append(nxt)
+    return seen
+
+
+def _check(board):
+    geo = board.geo
+    black, white = board.black_pos, board.white_pos
+
+    # Bölgeler engel olmayan kareleri ayrık ve bağlı parçalara böler
+    open_bits = board.free_bits | board.black_bits | board.white_bits
+    union = 0
+    for region in board.regions:
+        assert region and not region & union
+        union |= region
+        first = geo.cells[(region & -region).bit_length() - 1]
+        expected = sum(geo.bits[geo.index(pos)] for pos in _flood(board, first))
+        assert region == expected
+    assert union == open_bits
+
+    assert board.same_region() == (white in _flood(board, black))
+    assert board.reachable_area('B') == len(_flood(board, black, blocked={white}))
+    assert board.reachable_area('W') == len(_flood(board, white, blocked={black}))
+
+
+def _random_turn(board, side, rng):
+    turns = list(board.iter_turns(side))
+    if not turns:
+        return False
+    board.push(side, *board.turn_positions(rng.choice(turns)))
+    return True
+
+
+@pytest.mark.parametrize('seed', range(20))
+def test_regions_match_flood_fill(seed):
+    rng = random.Random(seed)
+    board = Board()
+    side = 'B'
+    _check(board)
+    while True:
+        if not _random_turn(board, side, rng):
+            break
+        side = 'W' if side == 'B' else 'B'
+        _check(board)
+
+        # Geri alma: bölgeler eski haline dönmeli; oyun başka turlarla sürer
+        if rng.random() < 0.3:
+            back = rng.randint(1, min(3, len(board._undo)))
+            for _ in range(back):
+                board.pop()
+                side = 'W' if side == 'B' else 'B'
+                _check(board)
+
+        # Kopya: kopya üzerinde oynanan turlar asıl tahtayı etkilememeli
+        if rng.random() < 0.2:
+            clone = board.copy()
+            before = (board.regions, board.reachable_area('B'), board.reachable_area('W'))
+            if _random_turn(clone, side, rng):
+                _check(clone)
+            assert (board.regions, board.reachable_area('B'),
+                    board.reachable_area('W')) == before
+            _check(board)